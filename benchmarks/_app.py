@@ -0,0 +1,48 @@
+"""
+벤치마크 공통 설정: 임시 SQLite DB에 시드 데이터를 넣고 앱을 ASGI로 직접 호출한다.
+
+main보다 먼저 import해야 환경 변수가 적용된다. 실제 maplewind.db와 .env의 DB는 사용하지 않는다.
+"""
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+_DB_DIR = tempfile.mkdtemp(prefix="maplewind-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+os.environ.setdefault("COOKIE_SECURE", "False")
+# 측정 대상이 아닌 제한/백그라운드 작업은 끔
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["COMMENT_STREAM_RELAY_SECONDS"] = "0"
+os.environ["SEED_ON_STARTUP"] = "True"
+
+import httpx
+
+SEED_USERNAME = "test"
+SEED_PASSWORD = "password123"
+
+
+@asynccontextmanager
+async def running_app() -> AsyncIterator[httpx.AsyncClient]:
+    """lifespan(스키마 생성, 시드)을 실행한 앱에 연결된 클라이언트를 반환한다."""
+    import logging
+
+    from main import app
+
+    logging.disable(logging.INFO)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+
+
+async def login(client: httpx.AsyncClient) -> dict[str, str]:
+    """시드 사용자로 로그인해 Authorization 헤더를 반환한다."""
+    response = await client.post("/api/v1/users/login", data={"username": SEED_USERNAME, "password": SEED_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
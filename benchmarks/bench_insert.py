@@ -0,0 +1,55 @@
+"""
+댓글 INSERT 처리량 벤치마크 (INSERT ... RETURNING vs 커밋 후 refresh).
+
+comment_repo.create로 댓글을 순차 저장하는 현재 방식과, 예전처럼 커밋 뒤 db.refresh로 id/created_at을 다시
+조회하는 방식을 같은 DB에서 비교한다. 저장 1건당 실행된 SQL 문 수도 함께 센다.
+
+    uv run python -m benchmarks.bench_insert
+    uv run python -m benchmarks.bench_insert --count 1000
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from benchmarks._app import running_app
+
+
+async def insert_comments(count: int, refresh: bool) -> tuple[float, Counter]:
+    from sqlalchemy import event
+
+    from database import async_session, engine
+    from models.comment import Comment
+    from repositories import comment_repo
+
+    statements: Counter = Counter()
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements[statement.split(None, 1)[0].upper()] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    start = time.perf_counter()
+    try:
+        for i in range(count):
+            async with async_session() as db:
+                comment = await comment_repo.create(db, Comment(user_id=None, author="bench", content=f"댓글 {i}"))
+                if refresh:
+                    await db.refresh(comment)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+    return time.perf_counter() - start, statements
+
+
+async def main(count: int) -> None:
+    async with running_app():
+        await insert_comments(20, refresh=False)  # 커넥션과 캐시 준비
+        for label, refresh in (("returning", False), ("commit+refresh", True)):
+            seconds, statements = await insert_comments(count, refresh)
+            per_insert = ", ".join(f"{name} {n / count:g}" for name, n in sorted(statements.items()))
+            print(f"{label:15} {count / seconds:7.0f} inserts/s  ({seconds:.2f}s)  statements per insert: {per_insert}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=300, help="방식별 저장할 댓글 수 (기본값 300)")
+    asyncio.run(main(parser.parse_args().count))
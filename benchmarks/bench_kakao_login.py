@@ -0,0 +1,115 @@
+"""
+카카오 로그인 지연 벤치마크 (공유 httpx 클라이언트).
+
+토큰 교환(/oauth/token)과 사용자 정보(/v2/user/me)에 응답하는 로컬 스텁 OAuth 서버를 띄우고
+POST /users/auth/kakao/login을 순차 호출해 로그인 1건당 지연 시간과 스텁 서버가 받은 새 TCP 연결 수를 잰다.
+앱의 공유 클라이언트와, 예전처럼 요청마다 새 클라이언트를 만드는 경우를 비교한다.
+
+    uv run python -m benchmarks.bench_kakao_login
+    uv run python -m benchmarks.bench_kakao_login --logins 200 --upstream-delay-ms 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks._app import percentile, running_app
+
+
+class StubKakaoHandler(BaseHTTPRequestHandler):
+    """카카오 OAuth/API 스텁. 새 TCP 연결 수를 server.connections에 센다."""
+
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘이 켜져 있으면 keep-alive 연결에서 지연 ACK만큼 늦어짐
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict) -> None:
+        time.sleep(self.server.delay_seconds)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send_json({"access_token": "stub-access-token", "token_type": "bearer"})
+
+    def do_GET(self):
+        self._send_json({"id": 9999, "kakao_account": {"profile": {"nickname": "스텁"}}})
+
+
+def start_stub_server(delay_seconds: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubKakaoHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.delay_seconds = delay_seconds
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def login_latencies(client, count: int) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.post("/api/v1/users/auth/kakao/login", params={"code": "stub-code"})
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return latencies
+
+
+async def main(logins: int, upstream_delay_ms: float) -> None:
+    server = start_stub_server(upstream_delay_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["KAKAO_AUTH_BASE_URL"] = base_url
+    os.environ["KAKAO_API_BASE_URL"] = base_url
+    os.environ.setdefault("KAKAO_CLIENT_ID", "stub-client-id")
+    os.environ.setdefault("KAKAO_REDIRECT_URI", "http://localhost/callback")
+
+    async with running_app() as client:
+        import httpx
+
+        from services import user_service
+
+        await login_latencies(client, 5)  # 첫 로그인(가입)과 커넥션 준비
+
+        per_request_clients: list[httpx.AsyncClient] = []
+
+        def new_client() -> httpx.AsyncClient:
+            per_request_clients.append(httpx.AsyncClient(timeout=10))
+            return per_request_clients[-1]
+
+        for label, factory in (("shared client", user_service.get_http_client), ("client per call", new_client)):
+            user_service.get_http_client, original = factory, user_service.get_http_client
+            server.connections = 0
+            try:
+                latencies = await login_latencies(client, logins)
+            finally:
+                user_service.get_http_client = original
+            print(
+                f"{label:16} avg {sum(latencies) / len(latencies) * 1000:6.2f} ms  "
+                f"p99 {percentile(latencies, 0.99) * 1000:6.2f} ms  new upstream connections {server.connections}"
+            )
+
+        for per_request_client in per_request_clients:
+            await per_request_client.aclose()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50, help="방식별 순차 로그인 수 (기본값 50)")
+    parser.add_argument("--upstream-delay-ms", type=float, default=2, help="스텁 서버 응답 지연 (기본값 2ms)")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.upstream_delay_ms))
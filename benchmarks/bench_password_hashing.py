@@ -0,0 +1,59 @@
+"""
+로그인 폭주 중 조회 지연 벤치마크 (bcrypt 스레드 풀).
+
+GET /characters의 지연 시간을 로그인 요청이 없을 때와 동시 로그인 요청이 몰릴 때 각각 측정한다.
+bcrypt가 이벤트 루프를 막지 않으면 두 경우의 p99가 비슷해야 하며, PASSWORD_HASH_MAX_PENDING을 넘은
+로그인은 503으로 거절된다.
+
+    uv run python -m benchmarks.bench_password_hashing
+    uv run python -m benchmarks.bench_password_hashing --logins 200 --reads 100
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from benchmarks._app import SEED_PASSWORD, SEED_USERNAME, percentile, running_app
+
+
+async def read_latencies(client, count: int) -> list[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/api/v1/characters")
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def login_status(client) -> int:
+    response = await client.post("/api/v1/users/login", data={"username": SEED_USERNAME, "password": SEED_PASSWORD})
+    return response.status_code
+
+
+def report(label: str, latencies: list[float]) -> None:
+    print(
+        f"{label:14} p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 0.95) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  max {max(latencies) * 1000:7.1f} ms"
+    )
+
+
+async def main(logins: int, reads: int) -> None:
+    async with running_app() as client:
+        await read_latencies(client, 5)  # 캐시와 커넥션 준비
+        report("idle", await read_latencies(client, reads))
+
+        latencies, *statuses = await asyncio.gather(
+            read_latencies(client, reads), *(login_status(client) for _ in range(logins))
+        )
+        report(f"{logins} logins", latencies)
+        print("login status", dict(sorted(Counter(statuses).items())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100, help="동시에 보낼 로그인 요청 수 (기본값 100)")
+    parser.add_argument("--reads", type=int, default=50, help="측정할 GET /characters 요청 수 (기본값 50)")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.reads))
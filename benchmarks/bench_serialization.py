@@ -0,0 +1,89 @@
+"""
+목록 응답 직렬화 마이크로 벤치마크 (cache.render_json).
+
+FastAPI response_model 기본 경로(검증 → jsonable 변환 → json.dumps)와 render_json의 검증/신뢰 경로를
+같은 ORM 객체로 비교한다. 세 경로의 출력 바이트가 같은지도 함께 확인한다.
+
+    uv run python -m benchmarks.bench_serialization
+    uv run python -m benchmarks.bench_serialization --rows 1000 10000 50000
+"""
+import argparse
+import datetime
+import json
+import os
+import timeit
+
+# 모델 import가 실제 DB 설정을 읽지 않도록 메모리 DB를 사용 (연결은 하지 않음)
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from pydantic import TypeAdapter
+
+from cache import render_json
+from models import Character, Comment, Settlement
+from schemas.character_dto import CharacterWithSettlementsResponse
+from schemas.comment_dto import CommentResponse
+
+NOW = datetime.datetime(2026, 10, 17, 1, 2, 3, 456789)
+
+
+def fastapi_default(response_type, rows) -> bytes:
+    """FastAPI가 response_model로 응답을 만드는 경로 (serialize_response + JSONResponse.render와 같은 출력)."""
+    adapter = TypeAdapter(response_type)
+    value = adapter.validate_python(rows, from_attributes=True)
+    return json.dumps(
+        adapter.dump_python(value, mode="json"), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+def make_comments(count: int) -> list[Comment]:
+    return [
+        Comment(id=i, user_id=i % 7 or None, author="관리자", content=f'댓글 내용 {i} "quoted"', created_at=NOW)
+        for i in range(count)
+    ]
+
+
+def make_characters(count: int, settlements_per_character: int = 5) -> list[Character]:
+    return [
+        Character(
+            id=i, name="강민아", detail_txt=None, level=265, job="아크", server="이브리스", avatar_url=None,
+            settlements=[
+                Settlement(
+                    id=i * settlements_per_character + j, character_id=i, title="검은 마법사 클리어",
+                    description=None, img_url=None, acquired_at=datetime.date(2026, 8, 29),
+                )
+                for j in range(settlements_per_character)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def bench(label: str, response_type, rows) -> None:
+    paths = {
+        "fastapi default": lambda: fastapi_default(response_type, rows),
+        "render_json validate": lambda: render_json(response_type, rows, validate=True),
+        "render_json trusted": lambda: render_json(response_type, rows),
+    }
+    outputs = {name: fn() for name, fn in paths.items()}
+    assert len(set(outputs.values())) == 1, f"{label}: 경로별 출력이 다름"
+
+    number = max(1, 20_000 // len(rows))
+    baseline = None
+    for name, fn in paths.items():
+        seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        baseline = baseline or seconds
+        print(f"{label:>24} {name:22} {seconds * 1000:9.2f} ms  x{baseline / seconds:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="댓글 행 수 (기본값: 1000 10000)")
+    args = parser.parse_args()
+
+    for count in args.rows:
+        bench(f"comments x{count}", list[CommentResponse], make_comments(count))
+    bench("characters x200 (+5)", list[CharacterWithSettlementsResponse], make_characters(200))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+쓰기 중 조회 처리량 벤치마크 (SQLite PRAGMA 프로필).
+
+댓글 작성(POST /comments)과 목록 조회(GET /comments)를 동시에 실행하면서 초당 처리 수와 실패한 쓰기 수를
+센다. 저널 모드마다 새 프로세스에서 측정하므로 SQLITE_* 환경 변수가 연결 시점에 그대로 적용된다.
+
+    uv run python -m benchmarks.bench_sqlite_profile
+    uv run python -m benchmarks.bench_sqlite_profile --journal-modes WAL DELETE --seconds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+
+async def measure(seconds: float, writers: int, readers: int) -> dict:
+    from benchmarks._app import login, running_app
+
+    async with running_app() as client:
+        headers = await login(client)
+        stop = asyncio.Event()
+        counts = {"reads": 0, "writes": 0, "write_errors": 0}
+
+        async def writer():
+            while not stop.is_set():
+                response = await client.post("/api/v1/comments", json={"content": "bench"}, headers=headers)
+                counts["writes" if response.status_code == 201 else "write_errors"] += 1
+
+        async def reader():
+            while not stop.is_set():
+                (await client.get("/api/v1/comments?limit=20")).raise_for_status()
+                counts["reads"] += 1
+
+        tasks = [asyncio.create_task(writer()) for _ in range(writers)]
+        tasks += [asyncio.create_task(reader()) for _ in range(readers)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return counts
+
+
+def run_profile(journal_mode: str, args: argparse.Namespace) -> dict:
+    """journal_mode를 적용한 새 프로세스에서 측정한다 (PRAGMA 설정은 import 시점에 읽힘)."""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--child",
+         "--seconds", str(args.seconds), "--writers", str(args.writers), "--readers", str(args.readers)],
+        env={**os.environ, "SQLITE_JOURNAL_MODE": journal_mode},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--journal-modes", nargs="+", default=["WAL", "DELETE"], help="비교할 저널 모드 (기본값 WAL DELETE)")
+    parser.add_argument("--seconds", type=float, default=3, help="프로필별 측정 시간 (기본값 3초)")
+    parser.add_argument("--writers", type=int, default=8, help="동시 댓글 작성 작업 수 (기본값 8)")
+    parser.add_argument("--readers", type=int, default=8, help="동시 목록 조회 작업 수 (기본값 8)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args.seconds, args.writers, args.readers))))
+        return
+
+    for journal_mode in args.journal_modes:
+        counts = run_profile(journal_mode, args)
+        print(
+            f"journal_mode={journal_mode:8} reads/s {counts['reads'] / args.seconds:7.0f}  "
+            f"writes/s {counts['writes'] / args.seconds:6.0f}  write errors {counts['write_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
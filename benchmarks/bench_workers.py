@@ -0,0 +1,126 @@
+"""
+uvicorn 워커 수별 조회 처리량 벤치마크 (WEB_CONCURRENCY 기본값 근거).
+
+prestart.py로 임시 SQLite DB에 스키마와 시드를 한 번 만든 뒤, Docker 이미지와 같은 방식(DB_INIT_ON_STARTUP=False)으로
+uvicorn을 --workers 1/2/4로 띄우고 조회 위주 요청(GET /characters, GET /comments)을 실제 HTTP로 보내
+워커 수마다 초당 처리 수와 p50/p99 지연 시간을 잰다.
+
+부하 생성기도 같은 호스트의 CPU를 쓰므로 코어 수가 워커 수 + 1보다 적으면 워커를 늘려도 처리량이 늘지 않는다.
+배포할 호스트(또는 같은 코어 수)에서 실행하세요.
+
+    uv run python -m benchmarks.bench_workers
+    uv run python -m benchmarks.bench_workers --workers 1 2 4 8 --seconds 10 --concurrency 128
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks._app import percentile
+
+# 조회 위주 요청 구성 (경로, 비중)
+READ_MIX = [
+    ("/api/v1/characters", 2),
+    ("/api/v1/comments?limit=20", 2),
+    ("/api/v1/characters/1/with-settlements", 1),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database() -> None:
+    """Docker CMD처럼 워커를 띄우기 전에 스키마와 시드를 한 번 만든다."""
+    subprocess.run([sys.executable, "prestart.py", "--seed"], env=os.environ, check=True, capture_output=True)
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--limit-concurrency", "2000", "--backlog", "2048", "--log-level", "warning"],
+        env={**os.environ, "DB_INIT_ON_STARTUP": "False", "LOG_LEVEL": "WARNING"},
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("uvicorn did not become ready")
+
+
+async def drive(client: httpx.AsyncClient, seconds: float, concurrency: int) -> tuple[list[float], int]:
+    """concurrency개의 연결로 seconds 동안 READ_MIX를 반복 요청해 지연 시간 목록과 실패 수를 반환한다."""
+    paths = [path for path, weight in READ_MIX for _ in range(weight)]
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker(offset: int):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get(paths[i % len(paths)])
+                ok = response.status_code == 200
+            except httpx.TransportError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+            i += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors
+
+
+async def measure(workers: int, seconds: float, concurrency: int) -> None:
+    port = free_port()
+    server = start_server(workers, port)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+            await wait_until_ready(client, server)
+            await drive(client, 1, concurrency)  # 워커별 캐시와 커넥션 준비
+            latencies, errors = await drive(client, seconds, concurrency)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(
+        f"workers {workers}  req/s {len(latencies) / seconds:7.0f}  "
+        f"p50 {percentile(latencies, 0.5) * 1000:6.1f} ms  p99 {percentile(latencies, 0.99) * 1000:6.1f} ms  "
+        f"errors {errors}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    prepare_database()
+    print(f"cpu cores {os.cpu_count()}  concurrency {args.concurrency}  {args.seconds:g}s per run")
+    for workers in args.workers:
+        await measure(workers, args.seconds, args.concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="비교할 워커 수 (기본값 1 2 4)")
+    parser.add_argument("--seconds", type=float, default=5, help="워커 수별 측정 시간 (기본값 5초)")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 연결 수 (기본값 64)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,174 @@
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Generic, NamedTuple, TypeVar, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from metrics import record_serialize
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """크기 제한(LRU 방출)과 항목별 만료 시간을 갖는 프로세스 내 캐시."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class JsonPayload(NamedTuple):
+    """한 번 직렬화해 둔 JSON 응답 본문과 그 ETag."""
+
+    body: bytes
+    etag: str
+
+
+@lru_cache
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+_DECORATOR_KINDS = (
+    "validators",
+    "field_validators",
+    "root_validators",
+    "field_serializers",
+    "model_serializers",
+    "model_validators",
+    "computed_fields",
+)
+
+
+def _contains_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in get_args(annotation))
+
+
+def _is_plain_model(model: type[BaseModel]) -> bool:
+    """검증기·직렬화기·별칭이 없어 ORM 속성 값을 그대로 옮겨도 response_model 직렬화 결과와 같은 모델인지."""
+    decorators = model.__pydantic_decorators__
+    if any(getattr(decorators, kind) for kind in _DECORATOR_KINDS):
+        return False
+    return model.model_config.get("from_attributes", False) and not any(
+        field.alias or field.serialization_alias or field.exclude for field in model.model_fields.values()
+    )
+
+
+def _scalar_reader(names: tuple[str, ...]) -> Callable[[Any], dict]:
+    """
+    스칼라 필드만 있는 모델용: 로드된 ORM 행은 컬럼 값이 인스턴스 __dict__에 있으므로 속성 디스크립터를 거치지 않고 읽는다.
+
+    만료되었거나 아직 로드되지 않은 속성이 있으면 getattr로 읽어 지연 로딩 동작을 그대로 따른다.
+    """
+    read_loaded = itemgetter(*names)
+    read_attributes = attrgetter(*names)
+
+    def read(obj: Any) -> dict:
+        try:
+            return dict(zip(names, read_loaded(obj.__dict__)))
+        except (AttributeError, KeyError):
+            return dict(zip(names, read_attributes(obj)))
+
+    return read
+
+
+@lru_cache
+def _extractor(response_type: Any) -> Callable[[Any], Any] | None:
+    """
+    ORM 객체를 response_type 모양의 dict/list로 옮기는 함수를 만든다 (검증 없이 속성만 읽음).
+
+    그렇게 옮길 수 없는 타입(검증기나 별칭이 있는 모델, 모델이 섞인 Union 등)이면 None을 반환한다.
+    """
+    if get_origin(response_type) is list:
+        item = _extractor(get_args(response_type)[0])
+        return None if item is None else (lambda rows: [item(row) for row in rows])
+
+    if isinstance(response_type, type) and issubclass(response_type, BaseModel):
+        if not _is_plain_model(response_type):
+            return None
+        fields: list[tuple[str, Callable[[Any], Any] | None]] = []
+        for name, field in response_type.model_fields.items():
+            if not _contains_model(field.annotation):
+                fields.append((name, None))
+            elif (extract := _extractor(field.annotation)) is not None:
+                fields.append((name, extract))
+            else:
+                return None
+        names = tuple(name for name, _ in fields)
+        if len(names) > 1 and all(extract is None for _, extract in fields):
+            return _scalar_reader(names)
+        return lambda obj: {
+            name: getattr(obj, name) if extract is None else extract(getattr(obj, name))
+            for name, extract in fields
+        }
+
+    return None if _contains_model(response_type) else (lambda value: value)
+
+
+def render_json(response_type: Any, data: Any, validate: bool = False) -> bytes:
+    """
+    ORM 객체를 response_model과 동일한 스키마의 JSON 바이트로 직렬화한다.
+
+    우리 DB에서 읽은 행은 이미 스키마를 만족하므로 기본적으로 검증 없이 필드 속성만 읽어 pydantic-core로
+    직렬화한다. validate=True이거나 그렇게 옮길 수 없는 모델이면 TypeAdapter로 검증한 뒤 직렬화한다.
+    """
+    start = time.perf_counter()
+    extract = None if validate else _extractor(response_type)
+    if extract is not None:
+        body = to_json(extract(data))
+    else:
+        adapter = _adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    record_serialize(time.perf_counter() - start)
+    return body
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def build_json_payload(response_type: Any, data: Any) -> JsonPayload:
+    body = render_json(response_type, data)
+    return JsonPayload(body=body, etag=make_etag(body))
@@ -1,13 +1,14 @@
 import os
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError, ExpiredSignatureError
 from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
-from database import get_db
+from database import get_db, get_read_db
 from repositories import user_repo
 from models.user import User
+from schemas.user_dto import UserPrincipal
+from services import user_service
 
 load_dotenv()
 
@@ -19,12 +20,44 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _decode_access_token(token: str) -> dict:
+    """
+    JWT 액세스 토큰을 검증하고 클레임을 반환합니다.
+
+    토큰 만료 시 detail "Token has expired", 그 외 검증 실패나 "sub" 클레임 누락 시 detail "Could not validate credentials"인 401 예외를 발생시킵니다.
+    """
+    from jose import ExpiredSignatureError, JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except JWTError:
+        raise _credentials_exception()
+
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ) -> User:
     """
     현재 요청의 JWT 액세스 토큰을 검증하고 토큰에 명시된 사용자명에 대응하는 User 객체를 반환합니다.
+
+    전체 User 엔터티가 필요한 엔드포인트(로그아웃, 탈퇴 등)에서만 사용하고, 그 외에는 `get_current_principal`을 사용합니다.
     
     검증 실패나 토큰 만료 시 401 Unauthorized HTTPException을 발생시킵니다. 토큰 만료인 경우 detail은 "Token has expired"이고, 그 외 인증 실패(토큰 무효, 페이로드에 사용자명 없음, 데이터베이스에 사용자 미발견 포함)인 경우 detail은 "Could not validate credentials"입니다.
     
@@ -34,30 +67,28 @@ async def get_current_user(
     Raises:
         HTTPException: 인증 실패 또는 토큰 만료로 인해 401 상태 코드를 가진 예외가 발생합니다.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    expired_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Token has expired",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except ExpiredSignatureError:
-        raise expired_exception
-    except JWTError:
-        raise credentials_exception
-        
-    user = await user_repo.get_by_username(db, username=username)
+    payload = _decode_access_token(token)
+    user = await user_repo.get_by_username(db, username=payload["sub"])
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
-__all__ = ["get_db", "get_current_user"]
\ No newline at end of file
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db, scope="function")
+) -> UserPrincipal:
+    """
+    현재 요청의 JWT 액세스 토큰을 검증하고 토큰 클레임으로 구성한 경량 사용자 정보를 반환합니다.
+
+    사용자 존재 여부는 `user_service.get_principal`의 TTL 캐시로 확인하므로 대부분의 요청은 DB를 조회하지 않습니다.
+
+    Raises:
+        HTTPException: 인증 실패 또는 토큰 만료 시 401.
+    """
+    payload = _decode_access_token(token)
+    principal = await user_service.get_principal(db, payload)
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+__all__ = ["get_db", "get_read_db", "get_current_user", "get_current_principal"]
\ No newline at end of file
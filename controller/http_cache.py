@@ -0,0 +1,82 @@
+import os
+import time
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from pydantic_core import to_json
+from dotenv import load_dotenv
+
+from cache import make_etag
+from metrics import record_serialize
+
+load_dotenv()
+
+# 조회 API 응답의 Cache-Control 헤더 (브라우저 및 nginx 엣지 캐시가 따름)
+READ_CACHE_CONTROL = os.getenv("READ_CACHE_CONTROL", "public, max-age=30")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    앱 기본 응답 클래스 (main의 default_response_class). 표준 json.dumps 대신 pydantic-core로 직렬화한다.
+
+    JSONResponse를 상속하므로 media_type과 OpenAPI 문서는 바뀌지 않는다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = to_json(content)
+        record_serialize(time.perf_counter() - start)
+        return body
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    Server-Sent Events 응답. 캐시와 nginx 버퍼링을 끄고, 클라이언트가 끊어지면 이벤트 제너레이터를 바로 닫는다.
+
+    StreamingResponse는 전송 실패로 끝날 때 body_iterator를 닫지 않으므로, 구독 해제 같은 정리 작업이
+    가비지 컬렉션 시점까지 미뤄지지 않도록 직접 aclose()를 호출한다.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, content, status_code: int = 200, headers: dict[str, str] | None = None):
+        super().__init__(
+            content,
+            status_code=status_code,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 비교는 약한 비교(W/ 접두사 무시)를 사용한다."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def conditional_json_response(
+    request: Request,
+    body: bytes,
+    etag: str | None = None,
+    cache_control: str = READ_CACHE_CONTROL,
+) -> Response:
+    """
+    본문의 강한 ETag와 Cache-Control을 붙인 JSON 응답을 만든다.
+
+    요청의 If-None-Match가 ETag와 일치하면 본문 없이 304 Not Modified를 반환한다.
+    """
+    etag = etag or make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from controller.dependencies import get_db
-from schemas.character_dto import CharacterDetailResponse, CharacterResponse
+from controller.dependencies import get_read_db
+from cache import render_json
+from controller.http_cache import conditional_json_response
+from schemas.character_dto import (
+    CharacterDetailResponse,
+    CharacterResponse,
+    CharacterWithSettlementsResponse,
+)
 from schemas.settlement_dto import SettlementResponse, SettlementDetailResponse
 from services import character_service, settlement_service
 
@@ -10,17 +16,44 @@ router = APIRouter(prefix="/characters", tags=["characters"])
 
 
 @router.get("", response_model=list[CharacterResponse])
-async def get_characters(db: AsyncSession = Depends(get_db)):
-    return await character_service.get_all_characters(db)
+async def get_characters(request: Request, db: AsyncSession = Depends(get_read_db, scope="function")):
+    payload = await character_service.get_all_characters_payload(db)
+    return conditional_json_response(request, payload.body, payload.etag)
+
+
+@router.get("/with-settlements", response_model=list[CharacterWithSettlementsResponse])
+async def get_characters_with_settlements(
+    request: Request,
+    ids: list[int] | None = Query(None),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+):
+    characters = await character_service.get_characters_with_settlements(db, ids)
+    return conditional_json_response(
+        request, render_json(list[CharacterWithSettlementsResponse], characters)
+    )
 
 
 @router.get("/{character_id}", response_model=CharacterDetailResponse)
-async def get_character(character_id: int, db: AsyncSession = Depends(get_db)):
-    return await character_service.get_character_info(db, character_id)
+async def get_character(
+    character_id: int, request: Request, db: AsyncSession = Depends(get_read_db, scope="function")
+):
+    character = await character_service.get_character_info(db, character_id)
+    return conditional_json_response(request, render_json(CharacterDetailResponse, character))
 
 
 @router.get("/{character_id}/settlements", response_model=list[SettlementResponse])
 async def get_character_settlements(
-    character_id: int, db: AsyncSession = Depends(get_db)
+    character_id: int, request: Request, db: AsyncSession = Depends(get_read_db, scope="function")
+):
+    payload = await settlement_service.get_settlements_by_character_payload(db, character_id)
+    return conditional_json_response(request, payload.body, payload.etag)
+
+
+@router.get("/{character_id}/with-settlements", response_model=CharacterWithSettlementsResponse)
+async def get_character_with_settlements(
+    character_id: int, request: Request, db: AsyncSession = Depends(get_read_db, scope="function")
 ):
-    return await settlement_service.get_settlements_by_character(db, character_id)
+    character = await character_service.get_character_with_settlements(db, character_id)
+    return conditional_json_response(
+        request, render_json(CharacterWithSettlementsResponse, character)
+    )
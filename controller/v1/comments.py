@@ -1,35 +1,92 @@
-from fastapi import APIRouter, Depends
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from controller.dependencies import get_db, get_current_user
-from models.user import User
+from controller.dependencies import get_db, get_read_db, get_current_principal
+from cache import render_json
+from controller.http_cache import EventStreamResponse
 from schemas.comment_dto import CommentCreate, CommentResponse
+from schemas.user_dto import UserPrincipal
 from services import comment_service
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
+# 연결이 끊겼을 때 브라우저(EventSource)가 다시 연결하기까지 기다릴 시간 (밀리초)
+STREAM_RETRY_MS = 3000
+
+
+def _sse_frame(event: comment_service.StreamEvent | None) -> bytes:
+    if event is None:
+        return b": heartbeat\n\n"
+    header = f"event: {event.event}\n"
+    if event.id is not None:
+        header += f"id: {event.id}\n"
+    return header.encode() + b"data: " + event.data + b"\n\n"
+
+
+async def _sse(events: AsyncIterator[comment_service.StreamEvent | None]) -> AsyncIterator[bytes]:
+    async with aclosing(events):
+        yield f"retry: {STREAM_RETRY_MS}\n\n".encode()
+        async for event in events:
+            yield _sse_frame(event)
+
 
 @router.get("", response_model=list[CommentResponse])
 async def get_comments(
     page: int = 1,
     limit: int = 20,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ):
-    return await comment_service.get_comments(db, page=page, limit=limit)
+    """
+    댓글 목록을 반환합니다.
+
+    `cursor`를 주면 키셋 페이지네이션으로 조회하며, 다음 페이지 커서는 `X-Next-Cursor`,
+    전체 댓글 수는 `X-Total-Count` 응답 헤더로 전달합니다.
+    """
+    comments, next_cursor = await comment_service.get_comments(
+        db, page=page, limit=limit, cursor=cursor
+    )
+    headers = {"X-Total-Count": str(await comment_service.get_total_count(db))}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(
+        content=render_json(list[CommentResponse], comments),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.get("/stream", response_class=EventStreamResponse)
+async def stream_comments(
+    last_event_id: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+):
+    """
+    새 댓글을 Server-Sent Events로 실시간 전달합니다.
+
+    새 댓글은 `event: comment`(data는 CommentResponse JSON, id는 댓글 id)로 전달되고, 연결 유지를 위해 주기적으로
+    하트비트 주석을 보냅니다. 재연결 시 브라우저가 보내는 `Last-Event-ID` 이후 댓글부터 이어 받으며,
+    놓친 댓글이 너무 많으면 `event: reset`을 보내므로 목록을 다시 조회하세요.
+    """
+    events = await comment_service.open_comment_stream(db, last_event_id)
+    return EventStreamResponse(_sse(events))
 
 
 @router.post("", response_model=CommentResponse, status_code=201)
 async def create_comment(
     data: CommentCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     """
     새 댓글을 생성하고 생성된 댓글을 반환합니다.
     
     Parameters:
         data (CommentCreate): 생성할 댓글의 내용과 관련 메타데이터.
-        current_user (User): 댓글 작성자(현재 인증된 사용자).
+        current_user (UserPrincipal): 댓글 작성자(현재 인증된 사용자).
     
     Returns:
         CommentResponse: 생성된 댓글 객체.
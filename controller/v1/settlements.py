@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from controller.dependencies import get_db
+from controller.dependencies import get_read_db
+from cache import render_json
+from controller.http_cache import conditional_json_response
 from schemas.settlement_dto import SettlementDetailResponse
 from services import settlement_service
 
@@ -10,6 +12,7 @@ router = APIRouter(prefix="/settlements", tags=["settlements"])
 
 @router.get("/{settlement_id}", response_model=SettlementDetailResponse)
 async def get_settlement_detail(
-    settlement_id: int, db: AsyncSession = Depends(get_db)
+    settlement_id: int, request: Request, db: AsyncSession = Depends(get_read_db, scope="function")
 ):
-    return await settlement_service.get_settlement_detail(db, settlement_id)
+    settlement = await settlement_service.get_settlement_detail(db, settlement_id)
+    return conditional_json_response(request, render_json(SettlementDetailResponse, settlement))
@@ -45,7 +45,7 @@ def _clear_refresh_cookie(response: Response):
     )
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db, scope="function")):
     """
     새 사용자를 생성합니다.
 
@@ -61,7 +61,7 @@ async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     사용자 자격증명을 검증하여 액세스 토큰을 발급하고 리프레시 토큰을 HttpOnly 쿠키에 저장한다.
@@ -77,7 +77,7 @@ async def login(
 async def kakao_login(
     response: Response,
     code: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     카카오 인가 코드로 로그인 흐름을 처리하여 기존 사용자는 액세스 토큰과 리프레시 토큰 쿠키를 설정하고, 신규 사용자는 등록 토큰을 반환한다.
@@ -108,7 +108,7 @@ async def kakao_login(
 async def kakao_register(
     response: Response,
     data: KakaoRegisterRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     카카오로 시작된 가입을 최종 완료하고 인증 토큰을 발급한다.
@@ -134,7 +134,7 @@ async def kakao_register(
 async def refresh_token(
     request: Request,
     response: Response,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Refresh token 쿠키를 사용해 새로운 액세스 토큰과 리프레시 토큰을 발급하고 리프레시 쿠키를 갱신(토큰 회전)한다.
@@ -160,7 +160,7 @@ async def refresh_token(
 async def logout(
     response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     사용자 로그아웃을 수행하고 서버·클라이언트 측에서 인증 정보를 제거한다.
@@ -179,7 +179,7 @@ async def logout(
 async def withdraw(
     response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     현재 사용자를 탈퇴 처리하고, 카카오 연동이 있으면 해당 연결을 끊은 뒤 리프레시 토큰 쿠키를 삭제한다.
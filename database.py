@@ -1,20 +1,172 @@
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import zlib
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event, exc, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateIndex, CreateTable
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 파일 잠금 없이 진행
+    fcntl = None
+
+from metrics import Counter, Gauge, record_db_query, registry
+from query_monitor import observe_query
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./maplewind.db")
+# 조회(GET) 전용 커넥션 풀이 사용할 DB URL (읽기 복제본이 없으면 DATABASE_URL과 동일)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL") or DATABASE_URL
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+
+# 커넥션 풀 설정 (워커 수와 DB 동시 처리량에 맞춰 조정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", DB_POOL_SIZE))
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", DB_MAX_OVERFLOW))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true"
+
+# 여러 워커가 동시에 시작할 때 스키마 생성/시드를 직렬화하는 잠금 파일
+DB_BOOTSTRAP_LOCK_FILE = os.getenv(
+    "DB_BOOTSTRAP_LOCK_FILE", os.path.join(tempfile.gettempdir(), "maplewind-bootstrap.lock")
+)
+
+# SQLite 연결마다 적용할 PRAGMA 프로필 (빈 값이면 해당 PRAGMA를 건너뜀)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-20000"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+}
+
+
+class PoolMetrics:
+    """커넥션 풀 체크아웃 대기 시간, 점유 시간과 타임아웃 횟수 누적값."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.checkins = 0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_hold(self, seconds: float) -> None:
+        self.checkins += 1
+        self.hold_seconds_total += seconds
+        self.hold_seconds_max = max(self.hold_seconds_max, seconds)
 
-DATABASE_URL = "sqlite+aiosqlite:///./maplewind.db"
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """커넥션을 얻기까지 기다린 시간을 metrics에 기록하는 풀."""
 
-# SQLite 외래 키(Foreign Key) 제약 조건 활성화
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
+    metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+class ReadTimedQueuePool(TimedQueuePool):
+    metrics = PoolMetrics()
+
+
+def _set_sqlite_pragmas(dbapi_connection, read_only: bool) -> None:
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    for name, value in SQLITE_PRAGMAS.items():
+        if value:
+            cursor.execute(f"PRAGMA {name}={value}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
     cursor.close()
 
+
+def _track_connection_hold(sync_engine, metrics: PoolMetrics) -> None:
+    """체크아웃부터 반납까지 요청이 커넥션을 점유한 시간을 metrics에 기록한다."""
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.record_hold(time.perf_counter() - checked_out_at)
+
+
+def _track_query_time(sync_engine) -> None:
+    """SQL 문 실행 시간을 metrics(전체 및 현재 요청)에 기록하고 느린 쿼리/N+1 감시(query_monitor)에 넘긴다."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        record_db_query(elapsed)
+        observe_query(statement, parameters, elapsed)
+
+
+def _create_engine(url: str, pool_class: type[TimedQueuePool], pool_size: int, max_overflow: int, read_only: bool = False):
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    _track_connection_hold(new_engine.sync_engine, pool_class.metrics)
+    _track_query_time(new_engine.sync_engine)
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite 외래 키(Foreign Key) 제약 조건 활성화 및 PRAGMA 프로필 적용
+        event.listen(
+            new_engine.sync_engine,
+            "connect",
+            lambda dbapi_connection, connection_record: _set_sqlite_pragmas(dbapi_connection, read_only),
+        )
+    return new_engine
+
+
+engine = _create_engine(DATABASE_URL, TimedQueuePool, DB_POOL_SIZE, DB_MAX_OVERFLOW)
+# 조회 전용 엔진: 쓰기 트랜잭션(로그인 토큰 갱신, 댓글 작성)과 커넥션을 다투지 않음
+read_engine = _create_engine(
+    READ_DATABASE_URL, ReadTimedQueuePool, DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW, read_only=True
+)
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async_read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -22,10 +174,142 @@ class Base(DeclarativeBase):
 
 
 async def get_db():
+    """
+    쓰기용 세션.
+
+    세션은 첫 쿼리를 실행할 때 풀에서 커넥션을 꺼내므로 캐시 적중이나 인증 실패로
+    쿼리 없이 끝나는 요청은 커넥션을 점유하지 않는다.
+    핸들러에서는 Depends(get_db, scope="function")로 선언해 응답 직렬화·전송 전에 세션을 닫는다.
+    """
     async with async_session() as session:
         yield session
 
 
+async def get_read_db():
+    """조회 전용 세션 (SQLite는 query_only 연결). 데이터를 변경하지 않는 GET 핸들러에서 사용한다."""
+    async with async_read_session() as session:
+        yield session
+
+
+def _create_missing_indexes(connection) -> None:
+    """기존 테이블에 모델에 선언된 인덱스 중 없는 것만 추가한다 (테이블 재생성 없음)."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _schema_fingerprint(dialect) -> int:
+    """모델에 선언된 테이블/인덱스 DDL의 CRC32 (SQLite user_version이 부호 있는 32비트 정수라 31비트로 자름)."""
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda index: str(index.name)):
+            ddl.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return zlib.crc32("\n".join(ddl).encode()) & 0x7FFFFFFF
+
+
+def _pool_stats(target_engine, pool_size: int, max_overflow: int) -> dict:
+    pool = target_engine.sync_engine.pool
+    metrics = pool.metrics
+    capacity = pool_size + max(max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "checked_out": checked_out,
+        "saturation": checked_out / capacity if capacity else 0.0,
+        "checkouts": metrics.checkouts,
+        "checkout_timeouts": metrics.timeouts,
+        "checkout_wait_seconds_total": metrics.wait_seconds_total,
+        "checkout_wait_seconds_avg": metrics.wait_seconds_total / metrics.checkouts if metrics.checkouts else 0.0,
+        "checkout_wait_seconds_max": metrics.wait_seconds_max,
+        "checkins": metrics.checkins,
+        "hold_seconds_total": metrics.hold_seconds_total,
+        "hold_seconds_avg": metrics.hold_seconds_total / metrics.checkins if metrics.checkins else 0.0,
+        "hold_seconds_max": metrics.hold_seconds_max,
+    }
+
+
+def get_pool_stats() -> dict:
+    """쓰기/조회 커넥션 풀별 사용량(포화도), 체크아웃 대기 시간과 커넥션 점유 시간 통계를 반환한다."""
+    return {
+        "write": _pool_stats(engine, DB_POOL_SIZE, DB_MAX_OVERFLOW),
+        "read": _pool_stats(read_engine, DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW),
+    }
+
+
+def _pool_stat(key: str):
+    return lambda: {(name,): stats[key] for name, stats in get_pool_stats().items()}
+
+
+registry.register(Gauge("db_pool_checked_out", "Connections currently checked out.", ("pool",), collect=_pool_stat("checked_out")))
+registry.register(Gauge("db_pool_saturation", "Checked-out connections / pool capacity.", ("pool",), collect=_pool_stat("saturation")))
+registry.register(Counter("db_pool_checkouts_total", "Connection checkouts.", ("pool",), collect=_pool_stat("checkouts")))
+registry.register(Counter("db_pool_checkout_timeouts_total", "Checkouts that timed out.", ("pool",), collect=_pool_stat("checkout_timeouts")))
+registry.register(
+    Counter("db_pool_checkout_wait_seconds_total", "Time spent waiting for a connection.", ("pool",),
+            collect=_pool_stat("checkout_wait_seconds_total"))
+)
+registry.register(
+    Counter("db_pool_hold_seconds_total", "Time connections were held between checkout and checkin.", ("pool",),
+            collect=_pool_stat("hold_seconds_total"))
+)
+
+
+async def log_sqlite_settings() -> None:
+    """
+    실제 연결에 적용된 SQLite PRAGMA 값을 쓰기/조회 엔진별로 로그로 남긴다.
+
+    스키마 생성(init_db)을 건너뛰는 워커도 자기 설정을 남기도록 main.lifespan에서 워커마다 호출한다.
+    """
+    for label, target, names in (
+        ("write", engine, ("foreign_keys", *SQLITE_PRAGMAS)),
+        ("read", read_engine, ("foreign_keys", *SQLITE_PRAGMAS, "query_only")),
+    ):
+        async with target.connect() as conn:
+            effective = {}
+            for name in names:
+                result = await conn.exec_driver_sql(f"PRAGMA {name}")
+                effective[name] = result.scalar()
+        logger.info(
+            "SQLite settings (%s): %s",
+            label,
+            ", ".join(f"{name}={value}" for name, value in effective.items()),
+        )
+
+
+@asynccontextmanager
+async def bootstrap_lock():
+    """
+    프로세스 간 파일 잠금(fcntl.flock)을 잡는다.
+
+    같은 호스트에서 여러 워커가 동시에 떠도 스키마 생성과 check-then-insert 시드가 한 번에 하나씩만 실행된다.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(DB_BOOTSTRAP_LOCK_FILE, "a") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 async def init_db():
+    """
+    테이블과 인덱스를 만든다.
+
+    SQLite는 PRAGMA user_version에 스키마 지문을 기록해 두고, 모델이 바뀌지 않았으면 다음 시작부터
+    create_all과 인덱스 확인 쿼리를 건너뛴다.
+    """
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        fingerprint = _schema_fingerprint(conn.dialect)
+        if IS_SQLITE and (await conn.exec_driver_sql("PRAGMA user_version")).scalar() == fingerprint:
+            logger.info("Schema is up to date (version %d), skipping create_all", fingerprint)
+        else:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_missing_indexes)
+            if IS_SQLITE:
+                await conn.exec_driver_sql(f"PRAGMA user_version = {fingerprint}")
@@ -0,0 +1,61 @@
+import importlib.util
+import os
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    import httpx
+
+load_dotenv()
+
+# 외부 API(카카오 OAuth 등) 호출에 공유하는 커넥션 풀 설정
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", 30))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 10))
+# h2 패키지가 설치되어 있을 때만 HTTP/2 사용
+HTTP2_ENABLED = (
+    os.getenv("HTTP2_ENABLED", "True").lower() == "true"
+    and importlib.util.find_spec("h2") is not None
+)
+
+_client: "httpx.AsyncClient | None" = None
+
+
+def _create_client() -> "httpx.AsyncClient":
+    # httpx는 외부 API를 처음 호출할 때 import해 읽기 요청만 처리하는 워커의 시작 시간을 줄인다
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=HTTP2_ENABLED,
+        timeout=HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    앱 전체에서 공유하는 httpx.AsyncClient를 반환한다.
+
+    연결을 keep-alive로 재사용하므로 요청마다 TCP/TLS 핸드셰이크를 하지 않는다.
+    처음 호출될 때 만들며, 앱 종료 시 main.lifespan에서 close_http_client로 닫는다.
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """공유 클라이언트의 커넥션을 모두 닫는다 (앱 종료 시 호출)."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,20 +1,48 @@
+import asyncio
 import datetime
+import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
 
-from database import async_session, init_db
+from controller.http_cache import FastJSONResponse
+from database import (
+    IS_SQLITE,
+    async_read_session,
+    async_session,
+    bootstrap_lock,
+    get_pool_stats,
+    init_db,
+    log_sqlite_settings,
+)
+from http_client import close_http_client
+from metrics import registry
+from middleware import CompressionMiddleware, MetricsMiddleware, QueryMonitorMiddleware, RateLimitMiddleware
+from query_monitor import DB_QUERY_DEBUG
 from models.character import Character
 from models.settlement import Settlement
 from models.comment import Comment
+from services import comment_service, user_service
 
 # 환경 변수 로드
 load_dotenv()
 
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# 워커 시작 시 스키마 생성/시드 실행 여부 (prestart.py로 미리 실행했다면 False)
+DB_INIT_ON_STARTUP = os.getenv("DB_INIT_ON_STARTUP", "True").lower() == "true"
+# 테스트용 기본 데이터 생성 여부 (개발 환경에서만 True로 설정하거나 `python prestart.py --seed`로 한 번 실행)
+SEED_ON_STARTUP = os.getenv("SEED_ON_STARTUP", "False").lower() == "true"
+
 async def seed_data():
     """
     데이터베이스에 테스트용 기본 데이터를 필요할 경우 생성한다.
@@ -116,28 +144,96 @@ async def seed_data():
         await db.commit()
 
 
+async def bootstrap(seed: bool = SEED_ON_STARTUP):
+    """스키마 생성과 (seed가 True이면) 시드를 프로세스 간 잠금 아래에서 실행한다 (prestart.py 또는 워커 lifespan에서 호출)."""
+    async with bootstrap_lock():
+        await init_db()
+        if seed:
+            await seed_data()
+
+
+async def reconcile_comment_total():
+    """댓글 집계 행을 COMMENT_TOTAL_RECONCILE_SECONDS 주기로 실제 댓글 수와 맞춘다."""
+    while True:
+        try:
+            async with async_session() as db:
+                await comment_service.reconcile_total_count(db)
+        except SQLAlchemyError:
+            # 종료 시 취소가 쿼리 중에 걸리면 DB 오류로 바뀌어 올라오므로, 취소 중이면 루프를 끝냄
+            if asyncio.current_task().cancelling():
+                raise
+            logger.exception("Failed to reconcile comment total")
+        await asyncio.sleep(comment_service.COMMENT_TOTAL_RECONCILE_SECONDS)
+
+
+async def relay_comment_stream():
+    """다른 워커가 저장한 댓글을 COMMENT_STREAM_RELAY_SECONDS 주기로 읽어 이 워커의 스트림 구독자에게 보낸다."""
+    while True:
+        try:
+            async with async_read_session() as db:
+                await comment_service.relay_new_comments(db)
+        except SQLAlchemyError:
+            # 종료 시 취소가 쿼리 중에 걸리면 DB 오류로 바뀌어 올라오므로, 취소 중이면 루프를 끝냄
+            if asyncio.current_task().cancelling():
+                raise
+            logger.exception("Failed to relay new comments")
+        await asyncio.sleep(comment_service.COMMENT_STREAM_RELAY_SECONDS)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-    await seed_data()
+    if DB_INIT_ON_STARTUP:
+        await bootstrap()
+    if IS_SQLITE:
+        # DB_INIT_ON_STARTUP=False(prestart.py가 스키마를 만드는 멀티 워커 구성)여도 워커마다 실제 적용된 PRAGMA를 남김
+        await log_sqlite_settings()
+    background_tasks = [asyncio.create_task(reconcile_comment_total())]
+    if comment_service.COMMENT_STREAM_RELAY_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(relay_comment_stream()))
     yield
+    for task in background_tasks:
+        task.cancel()
+    # 취소된 루프가 진행 중이던 쿼리와 세션 정리를 마칠 때까지 기다린 뒤 나머지 자원을 닫음
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await comment_service.shutdown_comment_writer()
+    await close_http_client()
+    user_service.shutdown_password_executor()
 
 
-app = FastAPI(title="단풍바람 (MapleWind) API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="단풍바람 (MapleWind) API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # CORS 설정: 보안을 위해 허용할 도메인을 명시합니다.
 # .env 파일에 ALLOWED_ORIGINS=http://localhost:3000,http://127.0.0.1:3000 와 같이 설정하세요.
 allowed_origins_str = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173")
 ALLOWED_ORIGINS = [origin.strip() for origin in allowed_origins_str.split(",")]
 
+# 개발/테스트용 요청별 쿼리 수·N+1 검사
+if DB_QUERY_DEBUG:
+    app.add_middleware(QueryMonitorMiddleware)
+
+# 요청 빈도/동시 처리 제한 (CORS보다 안쪽에 두어 429/503 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Retry-After"],
 )
 
+# 응답 압축 (Metrics 안쪽에 두어 압축 시간이 요청 지연 시간과 Server-Timing에 포함되도록 먼저 등록)
+app.add_middleware(CompressionMiddleware)
+
+# 요청 지연 시간/상태 코드/DB 쿼리 수 기록 및 Server-Timing 헤더 (가장 바깥에서 거절된 요청까지 집계)
+app.add_middleware(MetricsMiddleware)
+
 from controller.v1.characters import router as characters_router
 from controller.v1.settlements import router as settlements_router
 from controller.v1.comments import router as comments_router
@@ -155,3 +251,15 @@ app.include_router(users_router, prefix="/api/v1")
 async def health_check():
     """Health check endpoint for container orchestration."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """DB connection pool saturation and checkout wait time (internal, not proxied by nginx)."""
+    return get_pool_stats()
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Request latency, DB, bcrypt, pool and cache metrics in Prometheus text format (internal, not proxied by nginx)."""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,255 @@
+import bisect
+import math
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cache import TTLCache
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def samples(self) -> Iterable[str]:
+        return ()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _ValueMetric(Metric):
+    """값을 직접 갱신하거나, collect 콜백으로 렌더링 시점에 라벨별 값을 읽어 오는 지표."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Callable[[], dict[LabelValues, float]] | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        values = self._collect() if self._collect else self._values
+        for labels, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Counter(_ValueMetric):
+    type_name = "counter"
+
+
+class Gauge(_ValueMetric):
+    type_name = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # 라벨별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            formatted = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{formatted} {_format_value(self._sums[labels])}"
+            yield f"{self.name}_count{formatted} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(text/plain; version=0.0.4)으로 모든 지표를 렌더링한다."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(
+    Counter("http_requests_total", "HTTP requests by route, method and status.", ("method", "route", "status"))
+)
+http_request_duration_seconds = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being processed.")
+)
+db_queries_total = registry.register(Counter("db_queries_total", "SQL statements executed."))
+db_query_duration_seconds = registry.register(
+    Histogram("db_query_duration_seconds", "SQL statement execution time.")
+)
+db_queries_per_request = registry.register(
+    Histogram(
+        "db_queries_per_request",
+        "SQL statements executed per HTTP request.",
+        ("route",),
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+    )
+)
+
+_caches: dict[str, "TTLCache"] = {}
+
+
+def register_cache(name: str, cache: "TTLCache") -> None:
+    """TTLCache의 크기와 적중/미스 횟수를 /metrics에 노출한다."""
+    _caches[name] = cache
+
+
+cache_hits_total = registry.register(
+    Counter("cache_hits_total", "In-process cache hits.", ("cache",),
+            collect=lambda: {(name,): cache.hits for name, cache in _caches.items()})
+)
+cache_misses_total = registry.register(
+    Counter("cache_misses_total", "In-process cache misses.", ("cache",),
+            collect=lambda: {(name,): cache.misses for name, cache in _caches.items()})
+)
+cache_entries = registry.register(
+    Gauge("cache_entries", "Entries currently held in the in-process cache.", ("cache",),
+          collect=lambda: {(name,): len(cache) for name, cache in _caches.items()})
+)
+password_hash_duration_seconds = registry.register(
+    Histogram(
+        "password_hash_duration_seconds",
+        "bcrypt hash/verify time including executor queue wait.",
+        ("operation",),
+    )
+)
+
+http_compression_input_bytes_total = registry.register(
+    Counter("http_compression_input_bytes_total", "Response bytes before compression.", ("encoding",))
+)
+http_compression_output_bytes_total = registry.register(
+    Counter("http_compression_output_bytes_total", "Response bytes after compression.", ("encoding",))
+)
+http_compression_cpu_seconds_total = registry.register(
+    Counter(
+        "http_compression_cpu_seconds_total",
+        "CPU time spent compressing responses (cached variants cost nothing).",
+        ("encoding",),
+    )
+)
+
+
+@dataclass
+class RequestStats:
+    """요청 하나가 DB, 인증(bcrypt), 직렬화, 압축에 쓴 시간. 미들웨어가 contextvar로 요청마다 만든다."""
+
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    auth_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    compress_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats() -> RequestStats:
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+def record_db_query(seconds: float) -> None:
+    db_queries_total.inc()
+    db_query_duration_seconds.observe(seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += seconds
+
+
+def record_password_hash(operation: str, seconds: float) -> None:
+    password_hash_duration_seconds.observe(seconds, operation)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.auth_seconds += seconds
+
+
+def record_serialize(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
+
+
+def record_compression(encoding: str, original_bytes: int, compressed_bytes: int, cpu_seconds: float) -> None:
+    http_compression_input_bytes_total.inc(encoding, amount=original_bytes)
+    http_compression_output_bytes_total.inc(encoding, amount=compressed_bytes)
+    http_compression_cpu_seconds_total.inc(encoding, amount=cpu_seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.compress_seconds += cpu_seconds
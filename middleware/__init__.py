@@ -0,0 +1,13 @@
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.query_monitor import QueryMonitorMiddleware
+from middleware.rate_limit import InMemoryRateLimitBackend, RateLimitBackend, RateLimitMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "InMemoryRateLimitBackend",
+    "MetricsMiddleware",
+    "QueryMonitorMiddleware",
+    "RateLimitBackend",
+    "RateLimitMiddleware",
+]
@@ -0,0 +1,175 @@
+import gzip
+import math
+import os
+import time
+from collections.abc import Callable
+
+from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cache import TTLCache
+from metrics import record_compression, register_cache
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 (uv add brotli)
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성 (uv add zstandard)
+    zstandard = None
+
+load_dotenv()
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "True").lower() == "true"
+# 이보다 작은 응답 본문(바이트)은 압축하지 않음
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+# ETag가 있는 응답의 압축 결과를 (ETag, 인코딩)별로 보관할 최대 개수
+COMPRESSION_CACHE_MAXSIZE = int(os.getenv("COMPRESSION_CACHE_MAXSIZE", 512))
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "text/", "image/svg+xml")
+# SSE는 이벤트마다 바로 전달되어야 하므로 압축(버퍼링)하지 않음
+_STREAMING_TYPES = ("text/event-stream",)
+
+Encoder = Callable[[bytes], bytes]
+
+
+def default_encoders() -> dict[str, Encoder]:
+    """사용 가능한 인코더를 서버 선호 순서(zstd > br > gzip)로 반환한다. gzip은 항상 포함된다."""
+    encoders: dict[str, Encoder] = {}
+    if zstandard is not None:
+        encoders["zstd"] = zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, available: dict[str, Encoder]) -> str | None:
+    """Accept-Encoding의 q 값이 가장 높은 인코딩을 고른다. 같으면 서버 선호 순서를 따른다."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _is_compressible(status: int, headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return (
+        200 <= status
+        and status not in (204, 304)
+        and "content-encoding" not in headers
+        and "no-transform" not in headers.get("cache-control", "")
+        and content_type.startswith(_COMPRESSIBLE_TYPES)
+        and not content_type.startswith(_STREAMING_TYPES)
+    )
+
+
+class CompressionMiddleware:
+    """
+    응답 본문을 Accept-Encoding에 맞춰 zstd/br/gzip으로 압축하는 ASGI 미들웨어.
+
+    COMPRESSION_MIN_SIZE보다 작은 응답, 이미 인코딩된 응답, SSE 같은 스트리밍 응답은 그대로 보낸다.
+    ETag가 있는 조회 응답은 압축 결과를 (ETag, 인코딩)별로 캐시해 같은 본문을 다시 압축하지 않으며,
+    압축된 응답의 ETag는 약한 ETag(W/)로 바꾼다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoders: dict[str, Encoder] | None = None,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        enabled: bool = COMPRESSION_ENABLED,
+        cache_maxsize: int = COMPRESSION_CACHE_MAXSIZE,
+    ):
+        self.app = app
+        self.encoders = default_encoders() if encoders is None else encoders
+        self.min_size = min_size
+        self.enabled = enabled
+        self.cache: TTLCache[bytes] = TTLCache(maxsize=cache_maxsize, ttl=math.inf)
+        register_cache("compressed_responses", self.cache)
+
+    def _compress(self, encoding: str, body: bytes, etag: str | None) -> bytes:
+        key = (etag, encoding)
+        compressed = self.cache.get(key) if etag else None
+        cpu_seconds = 0.0
+        if compressed is None:
+            start = time.thread_time()
+            compressed = self.encoders[encoding](body)
+            cpu_seconds = time.thread_time() - start
+            if etag:
+                self.cache.set(key, compressed)
+        record_compression(encoding, len(body), len(compressed), cpu_seconds)
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encoders)
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if not _is_compressible(message["status"], headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                # 같은 URL이라도 Accept-Encoding에 따라 본문이 달라지므로 공유 캐시(nginx)가 구분하도록 표시
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            passthrough = True
+            if message.get("more_body", False) or len(body) < self.min_size:
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            etag = headers.get("etag")
+            compressed = self._compress(encoding, body, etag)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,67 @@
+import os
+import time
+
+from dotenv import load_dotenv
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import metrics
+
+load_dotenv()
+
+# 응답에 Server-Timing 헤더(db/auth/serialize/compress/total 소요 시간)를 붙일지 여부
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "True").lower() == "true"
+
+
+def _route_label(scope: Scope) -> str:
+    """경로 템플릿(/api/v1/characters/{character_id})으로 집계해 라벨 수가 늘어나지 않게 한다."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _server_timing(stats: metrics.RequestStats, total_seconds: float) -> str:
+    return ", ".join(
+        [
+            f"db;dur={stats.db_seconds * 1000:.1f};desc=\"{stats.db_queries} queries\"",
+            f"auth;dur={stats.auth_seconds * 1000:.1f}",
+            f"serialize;dur={stats.serialize_seconds * 1000:.1f}",
+            f"compress;dur={stats.compress_seconds * 1000:.1f}",
+            f"total;dur={total_seconds * 1000:.1f}",
+        ]
+    )
+
+
+class MetricsMiddleware:
+    """요청별 지연 시간·상태 코드·처리 중 요청 수·DB 쿼리 수를 metrics 레지스트리에 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app: ASGIApp, server_timing: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats = metrics.start_request_stats()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", _server_timing(stats, time.perf_counter() - start))
+            await send(message)
+
+        metrics.http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.http_requests_in_flight.dec()
+            method, route = scope["method"], _route_label(scope)
+            metrics.http_requests_total.inc(method, route, str(status_code))
+            metrics.http_request_duration_seconds.observe(time.perf_counter() - start, method, route)
+            metrics.db_queries_per_request.observe(stats.db_queries, route)
@@ -0,0 +1,19 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from query_monitor import report_query_log, track_queries
+
+
+class QueryMonitorMiddleware:
+    """개발/테스트용(DB_QUERY_DEBUG): 요청마다 실행된 SQL을 모아 쿼리 수 초과와 N+1 반복을 경고한다."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as log:
+            await self.app(scope, receive, send)
+        report_query_log(f"{scope['method']} {scope['path']}", log)
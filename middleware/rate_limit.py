@@ -0,0 +1,226 @@
+import ipaddress
+import math
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Protocol
+
+from dotenv import load_dotenv
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+load_dotenv()
+
+# 사용자별 버킷은 서명이 검증된 액세스 토큰의 sub로만 나눈다 (controller/dependencies와 같은 키)
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+# X-Real-IP를 클라이언트 IP로 믿을 프록시(nginx) 주소/대역 목록 (쉼표 구분, 비우면 헤더를 항상 무시)
+# 그 밖의 주소에서 온 요청은 직접 접속한 클라이언트가 헤더를 위조할 수 있으므로 연결 주소를 사용
+RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1,::1")
+# 메모리에 유지할 최대 버킷 수 (초과 시 가장 오래 쓰이지 않은 버킷부터 제거)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100_000))
+
+
+class RateLimitBackend(Protocol):
+    """토큰 버킷 상태 저장소. 여러 워커가 상태를 공유하려면 같은 인터페이스로 Redis 등의 구현을 넣는다."""
+
+    async def acquire(self, key: Hashable, rate_per_second: float, burst: int) -> float:
+        """토큰 1개를 소비하고 0을 반환한다. 토큰이 없으면 소비하지 않고 다시 시도할 때까지 기다릴 초를 반환한다."""
+        ...
+
+
+class InMemoryRateLimitBackend:
+    """프로세스 내 토큰 버킷 저장소 (워커마다 따로 계산됨)."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: Hashable, rate_per_second: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated_at) * rate_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+@dataclass
+class RouteGroup:
+    """같은 제한을 공유하는 엔드포인트 묶음. 분당 허용 횟수가 0이면 해당 기준의 제한을 두지 않는다."""
+
+    name: str
+    match: Callable[[str, str], bool]
+    ip_per_minute: int
+    user_per_minute: int
+    burst: int
+    max_concurrency: int
+    in_flight: int = 0
+
+
+def _route_group(
+    name: str,
+    match: Callable[[str, str], bool],
+    ip_per_minute: int,
+    user_per_minute: int,
+    burst: int,
+    max_concurrency: int,
+) -> RouteGroup:
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    return RouteGroup(
+        name=name,
+        match=match,
+        ip_per_minute=int(os.getenv(f"{prefix}_IP_PER_MINUTE", ip_per_minute)),
+        user_per_minute=int(os.getenv(f"{prefix}_USER_PER_MINUTE", user_per_minute)),
+        burst=int(os.getenv(f"{prefix}_BURST", burst)),
+        max_concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", max_concurrency)),
+    )
+
+
+def default_route_groups() -> list[RouteGroup]:
+    """먼저 일치하는 그룹이 적용된다. /api 밖의 경로(/health 등)는 제한하지 않는다."""
+    return [
+        # bcrypt 해싱과 카카오 호출이 있는 인증 요청
+        _route_group(
+            "auth",
+            lambda method, path: method == "POST" and path.startswith("/api/v1/users/"),
+            ip_per_minute=30, user_per_minute=0, burst=10, max_concurrency=32,
+        ),
+        # SQLite 쓰기 잠금을 쓰는 댓글 작성
+        _route_group(
+            "comment_write",
+            lambda method, path: method == "POST" and path.rstrip("/") == "/api/v1/comments",
+            ip_per_minute=120, user_per_minute=30, burst=10, max_concurrency=64,
+        ),
+        # 연결이 길게 유지되는 댓글 스트림: 동시 처리 상한 대신 구독자 상한(COMMENT_STREAM_MAX_SUBSCRIBERS)을 적용
+        _route_group(
+            "comment_stream",
+            lambda method, path: method == "GET" and path == "/api/v1/comments/stream",
+            ip_per_minute=30, user_per_minute=0, burst=10, max_concurrency=0,
+        ),
+        _route_group(
+            "api",
+            lambda method, path: path.startswith("/api/"),
+            ip_per_minute=600, user_per_minute=0, burst=100, max_concurrency=256,
+        ),
+    ]
+
+
+def _verified_subject(authorization: str) -> str | None:
+    """
+    Bearer 토큰의 서명과 만료를 검증하고 sub 클레임을 반환한다. 검증에 실패하면 None.
+
+    사용자별 버킷을 나누는 용도다. 서명을 확인하지 않으면 위조한 sub로 다른 사용자의 버킷을 비워
+    그 사용자의 요청을 막을 수 있으므로, 검증된 토큰만 사용자 기준으로 센다 (실패한 요청은 IP 버킷만 적용).
+    """
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or token.count(".") != 2 or not JWT_SECRET_KEY:
+        return None
+
+    from jose import JWTError, jwt
+
+    try:
+        claims = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    subject = claims.get("sub")
+    return subject if isinstance(subject, str) else None
+
+
+def _parse_networks(value: str) -> list[ipaddress.IPv4Network | ipaddress.IPv6Network]:
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    경로 그룹별 IP/사용자 토큰 버킷과 동시 처리 상한을 적용하는 ASGI 미들웨어.
+
+    한도를 넘은 요청은 대기열에 쌓지 않고 즉시 429(요청 빈도 초과) 또는 503(동시 처리 상한 초과)과
+    Retry-After 헤더로 거절한다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: RateLimitBackend | None = None,
+        groups: list[RouteGroup] | None = None,
+        enabled: bool = RATE_LIMIT_ENABLED,
+        trusted_proxies: str = RATE_LIMIT_TRUSTED_PROXIES,
+    ):
+        self.app = app
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.groups = default_route_groups() if groups is None else groups
+        self.enabled = enabled
+        self.trusted_proxies = _parse_networks(trusted_proxies)
+
+    def _is_trusted_proxy(self, peer: str) -> bool:
+        try:
+            address = ipaddress.ip_address(peer)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def _client_ip(self, scope: Scope, headers: dict[bytes, bytes]) -> str:
+        client = scope.get("client")
+        peer = client[0] if client else "unknown"
+        if b"x-real-ip" in headers and self._is_trusted_proxy(peer):
+            return headers[b"x-real-ip"].decode("latin-1")
+        return peer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        group = next((g for g in self.groups if g.match(method, path)), None)
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        retry_after = 0.0
+        if group.ip_per_minute > 0:
+            retry_after = await self.backend.acquire(
+                (group.name, "ip", self._client_ip(scope, headers)), group.ip_per_minute / 60, group.burst
+            )
+        if not retry_after and group.user_per_minute > 0 and b"authorization" in headers:
+            subject = _verified_subject(headers[b"authorization"].decode("latin-1"))
+            if subject is not None:
+                retry_after = await self.backend.acquire(
+                    (group.name, "user", subject), group.user_per_minute / 60, group.burst
+                )
+        if retry_after:
+            await _reject(429, "Too many requests", retry_after)(scope, receive, send)
+            return
+
+        if group.max_concurrency > 0 and group.in_flight >= group.max_concurrency:
+            await _reject(503, "Server is busy, please retry", 1)(scope, receive, send)
+            return
+
+        group.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.in_flight -= 1
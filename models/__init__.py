@@ -1,6 +1,7 @@
 from models.character import Character
 from models.settlement import Settlement
 from models.comment import Comment
+from models.comment_stat import CommentStat
 from models.user import User
 
-__all__ = ["Character", "Settlement", "Comment", "User"]
+__all__ = ["Character", "Settlement", "Comment", "CommentStat", "User"]
@@ -15,4 +15,9 @@ class Character(Base):
     server: Mapped[str] = mapped_column(String, nullable=False)
     avatar_url: Mapped[str | None] = mapped_column(String, nullable=True)
 
-    settlements = relationship("Settlement", back_populates="character", cascade="all, delete-orphan")
+    settlements = relationship(
+        "Settlement",
+        back_populates="character",
+        cascade="all, delete-orphan",
+        order_by="desc(Settlement.acquired_at)",
+    )
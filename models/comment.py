@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text, ForeignKey, func
+from sqlalchemy import DateTime, Index, Integer, String, Text, ForeignKey, desc, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database import Base
@@ -8,6 +8,12 @@ from database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # 커서 페이지네이션 (created_at, id) 탐색용
+        Index("ix_comments_created_at_id", desc("created_at"), desc("id")),
+    )
+    # INSERT ... RETURNING으로 server_default(created_at)를 함께 받아와 저장 후 refresh 조회를 없앰
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database import Base
+
+
+class CommentStat(Base):
+    """댓글 집계 값을 유지하는 단일 행 테이블 (COUNT(*) 전체 스캔 대체용)."""
+
+    __tablename__ = "comment_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -6,6 +6,9 @@ from database import Base
 
 class User(Base):
     __tablename__ = "users"
+    # 탈퇴한 사용자의 id를 새 가입자에게 다시 쓰지 않도록 함 (SQLite 기본 rowid는 가장 큰 id를 재사용해
+    # 이전 계정의 액세스 토큰 uid가 새 계정과 일치할 수 있음)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
@@ -16,10 +19,10 @@ class User(Base):
     kakao_id: Mapped[int | None] = mapped_column(BigInteger, unique=True, index=True, nullable=True)
     student_id: Mapped[str | None] = mapped_column(String, unique=True, index=True, nullable=True)
     nickname: Mapped[str | None] = mapped_column(String, nullable=True)
-    phone_number: Mapped[str | None] = mapped_column(String, nullable=True)
+    phone_number: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     birthdate: Mapped[date | None] = mapped_column(Date, nullable=True)
     gender: Mapped[str | None] = mapped_column(String, nullable=True)  # male / female
     
     # Refresh Token 보안을 위한 필드 추가
-    refresh_token_hash: Mapped[str | None] = mapped_column(String, nullable=True)
+    refresh_token_hash: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     refresh_token_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
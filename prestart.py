@@ -0,0 +1,23 @@
+"""
+서버 워커를 띄우기 전에 한 번 실행하는 준비 단계 (스키마 생성, 시드 데이터).
+
+    uv run python prestart.py           # 스키마만 생성 (이미 최신이면 건너뜀)
+    uv run python prestart.py --seed    # 테스트용 기본 데이터도 생성
+
+워커들은 DB_INIT_ON_STARTUP=False로 실행해 시작 시 이 작업을 건너뛴다.
+"""
+import argparse
+import asyncio
+
+from main import SEED_ON_STARTUP, bootstrap
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        default=SEED_ON_STARTUP,
+        help="테이블이 비어 있으면 테스트용 기본 데이터를 생성한다 (기본값: SEED_ON_STARTUP)",
+    )
+    args = parser.parse_args()
+    asyncio.run(bootstrap(seed=args.seed))
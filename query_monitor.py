@@ -0,0 +1,147 @@
+import logging
+import os
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import FrameType
+
+import greenlet
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 이 시간(ms)을 넘는 SQL 문을 호출한 repository 함수와 함께 경고 로그로 남김 (0이면 비활성)
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 0))
+# 개발용: 느린 쿼리 로그에 바인딩 값도 남김. 비밀번호 해시, 전화번호, 토큰 해시, 댓글 본문이 그대로 기록되므로 운영에서는 끔
+DB_SLOW_QUERY_LOG_PARAMS = os.getenv("DB_SLOW_QUERY_LOG_PARAMS", "False").lower() == "true"
+# 개발/테스트용: 요청마다 쿼리 수와 같은 SQL 반복(N+1)을 검사해 경고
+DB_QUERY_DEBUG = os.getenv("DB_QUERY_DEBUG", "False").lower() == "true"
+DB_QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", 20))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+
+_CALLER_PACKAGES = (f"{os.sep}repositories{os.sep}", f"{os.sep}services{os.sep}")
+_MAX_PARAMS_LOG_LENGTH = 500
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class QueryLog:
+    """하나의 요청(또는 query_budget 블록)에서 실행된 SQL 문과 그 호출 위치."""
+
+    statements: Counter[str] = field(default_factory=Counter)
+    callers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+    def describe(self, statement: str) -> str:
+        return f"{self.callers.get(statement, '?')}: {' '.join(statement.split())[:200]}"
+
+
+# 중첩된 track_queries 블록(예: 테스트의 query_budget과 QueryMonitorMiddleware)이 모두 기록하도록 튜플로 유지
+_query_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("query_logs", default=())
+
+
+def _frames(frame: FrameType | None) -> Iterator[FrameType]:
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def find_caller() -> str:
+    """
+    SQL 문을 실행한 repositories/services 함수의 위치를 찾는다.
+
+    AsyncSession의 SQL은 SQLAlchemy가 만든 자식 greenlet에서 실행되므로, 현재 스택에서 찾지 못하면
+    await하고 있는 부모 greenlet의 스택을 이어서 확인한다.
+    """
+    stacks = [sys._getframe(1)]
+    parent = greenlet.getcurrent().parent
+    if parent is not None:
+        stacks.append(parent.gr_frame)
+    for top in stacks:
+        for frame in _frames(top):
+            filename = frame.f_code.co_filename
+            if any(package in filename for package in _CALLER_PACKAGES):
+                module = filename.rsplit(os.sep, 2)
+                return f"{module[-2]}/{module[-1]}:{frame.f_code.co_name}:{frame.f_lineno}"
+    return "unknown"
+
+
+def observe_query(statement: str, parameters, seconds: float) -> None:
+    """database.py의 after_cursor_execute 이벤트에서 SQL 문 하나가 끝날 때마다 호출된다."""
+    if DB_SLOW_QUERY_MS and seconds * 1000 >= DB_SLOW_QUERY_MS:
+        if DB_SLOW_QUERY_LOG_PARAMS:
+            logger.warning(
+                "Slow query (%.1f ms) at %s: %s params=%s",
+                seconds * 1000,
+                find_caller(),
+                " ".join(statement.split()),
+                repr(parameters)[:_MAX_PARAMS_LOG_LENGTH],
+            )
+        else:
+            # SQLAlchemy의 hide_parameters처럼 바인딩 값은 남기지 않음
+            logger.warning(
+                "Slow query (%.1f ms) at %s: %s", seconds * 1000, find_caller(), " ".join(statement.split())
+            )
+
+    logs = _query_logs.get()
+    if logs:
+        caller = None
+        for log in logs:
+            log.statements[statement] += 1
+            if statement not in log.callers:
+                caller = caller or find_caller()
+                log.callers[statement] = caller
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryLog]:
+    """블록 안에서 (같은 태스크/컨텍스트로) 실행된 SQL 문을 QueryLog에 모은다."""
+    log = QueryLog()
+    token = _query_logs.set((*_query_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _query_logs.reset(token)
+
+
+def report_query_log(label: str, log: QueryLog) -> None:
+    """쿼리 수가 DB_QUERY_BUDGET을 넘거나 같은 SQL이 DB_N_PLUS_ONE_THRESHOLD번 이상 반복되면 경고 로그를 남긴다."""
+    if log.count > DB_QUERY_BUDGET:
+        logger.warning("%s issued %d queries (budget %d)", label, log.count, DB_QUERY_BUDGET)
+    for statement, n in log.repeated(DB_N_PLUS_ONE_THRESHOLD):
+        logger.warning("Possible N+1 in %s: %d x %s", label, n, log.describe(statement))
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None) -> Iterator[QueryLog]:
+    """
+    테스트용: 블록 안의 쿼리 수가 max_queries를 넘거나 같은 SQL이 max_repeats번을 넘게 반복되면 QueryBudgetExceeded를 발생시킨다.
+
+    앱과 같은 태스크에서 실행되는 httpx.AsyncClient(transport=httpx.ASGITransport(app=app))와 함께 사용한다.
+
+        with query_budget(2):
+            await client.get("/api/v1/characters/1/with-settlements")
+    """
+    with track_queries() as log:
+        yield log
+    problems = []
+    if log.count > max_queries:
+        problems.append(f"{log.count} queries (budget {max_queries})")
+    if max_repeats is not None:
+        problems.extend(f"{n} x {log.describe(statement)}" for statement, n in log.repeated(max_repeats + 1))
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
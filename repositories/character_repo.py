@@ -1,4 +1,5 @@
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.character import Character
@@ -12,3 +13,30 @@ async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100) -> list[Cha
 async def get_by_id(db: AsyncSession, char_id: int) -> Character | None:
     result = await db.execute(select(Character).where(Character.id == char_id))
     return result.scalar_one_or_none()
+
+
+async def get_with_settlements(db: AsyncSession, char_id: int) -> Character | None:
+    result = await db.execute(
+        select(Character)
+        .options(joinedload(Character.settlements))
+        .where(Character.id == char_id)
+    )
+    return result.unique().scalar_one_or_none()
+
+
+async def get_all_with_settlements(
+    db: AsyncSession, char_ids: list[int] | None = None, skip: int = 0, limit: int | None = None
+) -> list[Character]:
+    # limit이 없으면 전체를 반환한다 (/characters/with-settlements는 ids 생략 시 전체 목록)
+    stmt = (
+        select(Character)
+        .options(selectinload(Character.settlements))
+        .order_by(Character.id)
+        .offset(skip)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    if char_ids:
+        stmt = stmt.where(Character.id.in_(char_ids))
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
@@ -1,7 +1,12 @@
-from sqlalchemy import select, func
+import datetime
+
+from sqlalchemy import String, insert, select, func, literal, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.comment import Comment
+from models.comment_stat import CommentStat
+
+COMMENT_STAT_ID = 1
 
 
 async def get_all(
@@ -9,20 +14,111 @@ async def get_all(
 ) -> list[Comment]:
     result = await db.execute(
         select(Comment)
-        .order_by(Comment.created_at.desc())
+        .order_by(Comment.created_at.desc(), Comment.id.desc())
         .offset(skip)
         .limit(limit)
     )
     return list(result.scalars().all())
 
 
+async def get_before(
+    db: AsyncSession, created_at: datetime.datetime, comment_id: int, limit: int = 20
+) -> list[Comment]:
+    """
+    (created_at, id) 커서 바로 다음(더 오래된) 댓글들을 인덱스 탐색으로 조회합니다.
+
+    SQLite는 created_at을 server_default(CURRENT_TIMESTAMP)가 저장한 문자열 형식과 맞춰 비교하고,
+    그 외 DB(PostgreSQL 등)는 타임스탬프 타입으로 바인딩합니다.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        stored_created_at = literal(created_at.isoformat(sep=" "), String)
+    else:
+        stored_created_at = literal(created_at, Comment.created_at.type)
+    result = await db.execute(
+        select(Comment)
+        .where(tuple_(Comment.created_at, Comment.id) < tuple_(stored_created_at, literal(comment_id)))
+        .order_by(Comment.created_at.desc(), Comment.id.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
 async def get_total_count(db: AsyncSession) -> int:
     result = await db.execute(select(func.count(Comment.id)))
     return result.scalar_one()
 
 
+async def get_maintained_total(db: AsyncSession) -> int | None:
+    result = await db.execute(
+        select(CommentStat.total).where(CommentStat.id == COMMENT_STAT_ID)
+    )
+    return result.scalar_one_or_none()
+
+
+async def reconcile_total(db: AsyncSession) -> int:
+    """
+    유지 중인 댓글 집계 값을 실제 COUNT(*)로 다시 맞추고 그 값을 반환합니다.
+
+    갱신은 단일 UPDATE 문으로 수행되어 동시에 커밋되는 댓글 증가분을 덮어쓰지 않으며, 집계 행이 없으면 새로 만듭니다.
+    """
+    result = await db.execute(
+        update(CommentStat)
+        .where(CommentStat.id == COMMENT_STAT_ID)
+        .values(total=select(func.count(Comment.id)).scalar_subquery())
+        .returning(CommentStat.total)
+    )
+    total = result.scalar_one_or_none()
+    if total is None:
+        total = await get_total_count(db)
+        db.add(CommentStat(id=COMMENT_STAT_ID, total=total))
+    await db.commit()
+    return total
+
+
+async def _increment_total(db: AsyncSession, amount: int) -> None:
+    await db.execute(
+        update(CommentStat)
+        .where(CommentStat.id == COMMENT_STAT_ID)
+        .values(total=CommentStat.total + amount)
+    )
+
+
 async def create(db: AsyncSession, comment: Comment) -> Comment:
+    """
+    댓글을 저장하고 집계 행을 1 증가시킵니다.
+
+    id와 created_at(server_default)은 Comment의 eager_defaults 설정으로 INSERT ... RETURNING에서 바로 채워지므로
+    커밋 후 refresh로 다시 조회하지 않습니다.
+    """
     db.add(comment)
+    await _increment_total(db, 1)
     await db.commit()
-    await db.refresh(comment)
     return comment
+
+
+async def create_many(db: AsyncSession, rows: list[dict]) -> list[Comment]:
+    """
+    여러 댓글을 한 트랜잭션에서 다중 행 INSERT ... RETURNING으로 저장하고 집계 행도 함께 증가시킵니다.
+
+    반환 목록의 순서는 rows의 순서와 같습니다.
+    """
+    result = await db.scalars(
+        insert(Comment).returning(Comment, sort_by_parameter_order=True), rows
+    )
+    comments = list(result.all())
+    await _increment_total(db, len(comments))
+    await db.commit()
+    return comments
+
+
+async def get_after_id(db: AsyncSession, comment_id: int, limit: int = 100) -> list[Comment]:
+    """id가 comment_id보다 큰 댓글을 id 오름차순(저장 순서)으로 기본 키 범위 탐색해 조회합니다."""
+    result = await db.execute(
+        select(Comment).where(Comment.id > comment_id).order_by(Comment.id).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_latest_id(db: AsyncSession) -> int | None:
+    result = await db.execute(select(func.max(Comment.id)))
+    return result.scalar_one()
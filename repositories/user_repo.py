@@ -1,21 +1,22 @@
-from sqlalchemy import select
+from sqlalchemy import case, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user import User
 
 async def create(db: AsyncSession, user: User) -> User:
     """
-    새 User 인스턴스를 데이터베이스에 저장하고, 커밋 후 최신 상태로 갱신합니다.
+    새 User 인스턴스를 데이터베이스에 저장하고 커밋합니다.
+
+    id는 INSERT 시점에 채워지고 세션이 expire_on_commit=False이므로 커밋 후 다시 조회(refresh)하지 않습니다.
     
     Parameters:
         user (User): 저장할 User 엔티티 인스턴스.
     
     Returns:
-        User: 데이터베이스에 커밋되고 refresh 되어 최신 상태인 User 객체.
+        User: 데이터베이스에 커밋된 User 객체.
     """
     db.add(user)
     await db.commit()
-    await db.refresh(user)
     return user
 
 async def get_by_username(db: AsyncSession, username: str) -> User | None:
@@ -41,6 +42,32 @@ async def get_by_kakao_id(db: AsyncSession, kakao_id: int) -> User | None:
     result = await db.execute(select(User).where(User.kakao_id == kakao_id))
     return result.scalar_one_or_none()
 
+async def get_by_kakao_identity(db: AsyncSession, kakao_id: int, phone_number: str | None) -> User | None:
+    """
+    카카오 사용자를 kakao_ 접두사 username, kakao_id, 전화번호 중 하나로 한 번의 쿼리에서 찾는다.
+
+    세 조건 모두 인덱스가 있는 컬럼이며, 여러 계정이 일치하면 username > kakao_id > 전화번호 순으로 우선한다.
+    
+    Parameters:
+        kakao_id (int): 카카오 플랫폼에서 발급된 사용자 식별자.
+        phone_number (str | None): 카카오 계정의 전화번호 (없으면 전화번호 조건은 제외)
+    
+    Returns:
+        `User` 인스턴스 조회 결과, 없으면 `None`.
+    """
+    username = f"kakao_{kakao_id}"
+    conditions = [User.username == username, User.kakao_id == kakao_id]
+    if phone_number:
+        conditions.append(User.phone_number == phone_number)
+
+    result = await db.execute(
+        select(User)
+        .where(or_(*conditions))
+        .order_by(case((User.username == username, 0), (User.kakao_id == kakao_id, 1), else_=2))
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
 async def get_by_phone_number(db: AsyncSession, phone_number: str) -> User | None:
     """
     전화번호로 데이터베이스에서 사용자 엔티티를 조회한다.
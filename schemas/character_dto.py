@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from schemas.settlement_dto import SettlementResponse
+
 
 class CharacterBase(BaseModel):
     name: str
@@ -18,3 +20,8 @@ class CharacterResponse(CharacterBase):
 
 class CharacterDetailResponse(CharacterResponse):
     pass
+
+
+class CharacterWithSettlementsResponse(CharacterResponse):
+    """캐릭터와 획득일 내림차순 결산 목록을 한 번에 반환하는 응답"""
+    settlements: list[SettlementResponse]
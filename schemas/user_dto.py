@@ -11,6 +11,13 @@ class UserResponse(UserBase):
     id: int
     model_config = {"from_attributes": True}
 
+class UserPrincipal(BaseModel):
+    """액세스 토큰 클레임으로 구성한 인증 사용자 정보 (전체 User 조회 없이 사용)"""
+    id: int
+    username: str
+    name: str
+    model_config = {"from_attributes": True}
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -1,16 +1,101 @@
+import os
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
 
+from cache import JsonPayload, TTLCache, build_json_payload
+from metrics import register_cache
 from repositories import character_repo
 from models.character import Character
+from schemas.character_dto import CharacterResponse
+from services import settlement_service
+
+load_dotenv()
+
+# 캐릭터 조회 캐시 설정 (초 단위 / 최대 항목 수)
+CHARACTER_LIST_CACHE_SECONDS = float(os.getenv("CHARACTER_LIST_CACHE_SECONDS", 60))
+CHARACTER_DETAIL_CACHE_SECONDS = float(os.getenv("CHARACTER_DETAIL_CACHE_SECONDS", 60))
+READ_CACHE_MAXSIZE = int(os.getenv("READ_CACHE_MAXSIZE", 1024))
+
+character_cache: TTLCache[Character | list[Character] | JsonPayload] = TTLCache(maxsize=READ_CACHE_MAXSIZE)
+register_cache("character", character_cache)
 
 
 async def get_all_characters(db: AsyncSession) -> list[Character]:
-    return await character_repo.get_all(db)
+    characters = character_cache.get("all")
+    if characters is None:
+        characters = await character_repo.get_all(db)
+        character_cache.set("all", characters, ttl=CHARACTER_LIST_CACHE_SECONDS)
+    return characters
+
+
+async def get_all_characters_payload(db: AsyncSession) -> JsonPayload:
+    """
+    캐릭터 목록 응답을 미리 직렬화한 JSON 바이트로 반환한다.
+
+    직렬화 결과는 목록 캐시와 같은 CHARACTER_LIST_CACHE_SECONDS 동안만 유지한다. 만료되면 DB에서 다시 읽어
+    목록 캐시와 함께 갱신하므로, prestart 시드나 DB 직접 수정으로 바뀐 데이터도 모든 워커에서 그 시간 안에 반영된다.
+    """
+    payload = character_cache.get("all:payload")
+    if payload is None:
+        character_cache.invalidate("all")
+        payload = build_json_payload(list[CharacterResponse], await get_all_characters(db))
+        character_cache.set("all:payload", payload, ttl=CHARACTER_LIST_CACHE_SECONDS)
+    return payload
+
+
+async def get_character_with_settlements(db: AsyncSession, char_id: int) -> Character:
+    """캐릭터와 정렬된 결산 목록을 단일 조인 쿼리로 함께 조회한다."""
+    character = character_cache.get(("with_settlements", char_id))
+    if character is None:
+        character = await character_repo.get_with_settlements(db, char_id)
+        if not character:
+            raise HTTPException(status_code=404, detail="Character not found")
+        character_cache.set(("with_settlements", char_id), character, ttl=CHARACTER_DETAIL_CACHE_SECONDS)
+    return character
+
+
+async def get_characters_with_settlements(
+    db: AsyncSession, char_ids: list[int] | None = None
+) -> list[Character]:
+    """
+    여러 캐릭터를 결산 목록과 함께 조회한다 (캐릭터 1회 + 결산 1회, N+1 없음).
+
+    char_ids가 없으면 전체 목록을 캐시해 두고, 특정 ID 목록 조회는 캐시하지 않는다.
+    """
+    if char_ids:
+        return await character_repo.get_all_with_settlements(db, char_ids)
+
+    characters = character_cache.get("all:with_settlements")
+    if characters is None:
+        characters = await character_repo.get_all_with_settlements(db)
+        character_cache.set("all:with_settlements", characters, ttl=CHARACTER_LIST_CACHE_SECONDS)
+    return characters
 
 
 async def get_character_info(db: AsyncSession, char_id: int) -> Character:
-    character = await character_repo.get_by_id(db, char_id)
-    if not character:
-        raise HTTPException(status_code=404, detail="Character not found")
+    character = character_cache.get(("detail", char_id))
+    if character is None:
+        character = await character_repo.get_by_id(db, char_id)
+        if not character:
+            raise HTTPException(status_code=404, detail="Character not found")
+        character_cache.set(("detail", char_id), character, ttl=CHARACTER_DETAIL_CACHE_SECONDS)
     return character
+
+
+def invalidate_character_cache(char_id: int | None = None) -> None:
+    """
+    캐릭터 데이터를 변경하는 쓰기 경로에서 호출하여 캐시된 조회 결과를 무효화한다.
+
+    char_id가 없으면 모든 캐릭터 항목을 비운다. 캐릭터 존재 여부에 의존하는 결산 캐시도 함께 무효화한다.
+    """
+    if char_id is None:
+        character_cache.clear()
+    else:
+        character_cache.invalidate("all")
+        character_cache.invalidate("all:payload")
+        character_cache.invalidate("all:with_settlements")
+        character_cache.invalidate(("detail", char_id))
+        character_cache.invalidate(("with_settlements", char_id))
+    settlement_service.invalidate_settlement_cache(character_id=char_id)
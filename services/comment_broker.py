@@ -0,0 +1,65 @@
+import asyncio
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Subscription(Generic[T]):
+    """Broker 구독자 하나의 크기 제한 큐."""
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue[T | None] = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def offer(self, item: T) -> bool:
+        """큐에 여유가 있으면 항목을 넣고 True, 가득 찼으면 False를 반환한다 (기다리지 않음)."""
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def drop(self) -> None:
+        """쌓인 항목을 버리고 get()이 None을 반환하도록 한다."""
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> T | None:
+        """다음 항목을 기다린다. 느린 구독자로 끊겼으면 None을 반환한다."""
+        return await self._queue.get()
+
+
+class Broker(Generic[T]):
+    """
+    프로세스 내 발행/구독 팬아웃.
+
+    publish()는 기다리지 않고 각 구독자 큐에 항목을 넣으며, 큐가 가득 찬(소비가 늦은) 구독자는 끊는다.
+    느린 구독자 하나가 발행자나 다른 구독자를 막지 않도록 하기 위함이며, 끊긴 구독자는 마지막으로 받은 id부터
+    다시 구독해 이어 받는다. 구독자는 워커 프로세스마다 따로 관리된다.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.dropped_count = 0
+        self._subscribers: set[Subscription[T]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription[T]:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription[T]) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, item: T) -> None:
+        for subscription in list(self._subscribers):
+            if not subscription.offer(item):
+                self._subscribers.discard(subscription)
+                subscription.drop()
+                self.dropped_count += 1
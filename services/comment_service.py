@@ -1,40 +1,351 @@
+import asyncio
+import base64
+import binascii
+import datetime
+import os
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import NamedTuple
+
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
 
+from cache import render_json
+from database import async_session
+from metrics import Counter, Gauge, registry
 from models.comment import Comment
-from models.user import User
 from repositories import comment_repo
-from schemas.comment_dto import CommentCreate
+from schemas.comment_dto import CommentCreate, CommentResponse
+from schemas.user_dto import UserPrincipal
+from services.comment_broker import Broker, Subscription
+from services.comment_writer import BatchWriter
+
+load_dotenv()
+
+# 댓글 총 개수 캐시 설정 (초 단위)
+COMMENT_TOTAL_CACHE_SECONDS = float(os.getenv("COMMENT_TOTAL_CACHE_SECONDS", 5))
+COMMENT_TOTAL_RECONCILE_SECONDS = float(os.getenv("COMMENT_TOTAL_RECONCILE_SECONDS", 300))
+
+# 댓글 저장 방식: direct(요청마다 커밋) 또는 batch(모아서 다중 행 INSERT로 한 번에 커밋)
+COMMENT_WRITE_MODE = os.getenv("COMMENT_WRITE_MODE", "direct").lower()
+COMMENT_BATCH_INTERVAL_MS = float(os.getenv("COMMENT_BATCH_INTERVAL_MS", 20))
+COMMENT_BATCH_MAX_SIZE = int(os.getenv("COMMENT_BATCH_MAX_SIZE", 200))
+
+# 실시간 댓글 스트림(SSE) 설정
+# 워커당 최대 구독자 수. 열린 스트림도 uvicorn --limit-concurrency에 포함되므로, 상한에 닿아도 일반 요청과
+# /health가 503을 받지 않도록 UVICORN_LIMIT_CONCURRENCY가 설정되어 있으면 그 절반을 넘지 않게 한다
+COMMENT_STREAM_MAX_SUBSCRIBERS = int(os.getenv("COMMENT_STREAM_MAX_SUBSCRIBERS", 1000))
+if os.getenv("UVICORN_LIMIT_CONCURRENCY"):
+    COMMENT_STREAM_MAX_SUBSCRIBERS = min(
+        COMMENT_STREAM_MAX_SUBSCRIBERS, int(os.getenv("UVICORN_LIMIT_CONCURRENCY")) // 2
+    )
+# 구독자별 대기 이벤트 수 (가득 차면 느린 구독자로 보고 연결을 끊음)
+COMMENT_STREAM_QUEUE_SIZE = int(os.getenv("COMMENT_STREAM_QUEUE_SIZE", 100))
+COMMENT_STREAM_HEARTBEAT_SECONDS = float(os.getenv("COMMENT_STREAM_HEARTBEAT_SECONDS", 15))
+# Last-Event-ID로 재연결할 때 이어 보낼 최대 댓글 수 (넘으면 reset 이벤트로 목록을 다시 받게 함)
+COMMENT_STREAM_RESUME_LIMIT = int(os.getenv("COMMENT_STREAM_RESUME_LIMIT", 100))
+# 다른 워커가 저장한 댓글을 읽어 오는 주기 (초 단위, 0이면 사용 안 함 - 단일 워커)
+COMMENT_STREAM_RELAY_SECONDS = float(os.getenv("COMMENT_STREAM_RELAY_SECONDS", 1))
+
+_cached_total: int | None = None
+_cached_total_expires_at = 0.0
+_comment_writer: BatchWriter[Comment] | None = None
+
+
+class StreamEvent(NamedTuple):
+    """스트림으로 보낼 이벤트 하나. id가 있으면 클라이언트가 재연결할 때 Last-Event-ID로 돌려준다."""
+
+    event: str
+    data: bytes
+    id: int | None = None
 
 
-async def get_comments(db: AsyncSession, page: int = 1, limit: int = 20) -> list[Comment]:
+_comment_broker: Broker[StreamEvent] = Broker(queue_size=COMMENT_STREAM_QUEUE_SIZE)
+# 이 워커에서 이미 발행한 댓글 id (직접 발행과 다른 워커 릴레이가 겹칠 때 중복 방지)
+_published_ids: OrderedDict[int, None] = OrderedDict()
+_PUBLISHED_IDS_MAXSIZE = 10_000
+_RELAY_BATCH_SIZE = 500
+_relay_after_id: int | None = None
+
+registry.register(
+    Gauge(
+        "comment_stream_subscribers",
+        "Open comment stream connections in this worker.",
+        collect=lambda: {(): _comment_broker.subscriber_count},
+    )
+)
+registry.register(
+    Counter(
+        "comment_stream_dropped_total",
+        "Comment stream subscribers disconnected for falling behind.",
+        collect=lambda: {(): _comment_broker.dropped_count},
+    )
+)
+
+
+def _encode_cursor(comment: Comment) -> str:
+    raw = f"{comment.created_at.isoformat()}|{comment.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, comment_id = raw.split("|", 1)
+        return datetime.datetime.fromisoformat(created_at), int(comment_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+async def get_comments(
+    db: AsyncSession, page: int = 1, limit: int = 20, cursor: str | None = None
+) -> tuple[list[Comment], str | None]:
     """
-    페이지 번호와 페이지 크기(limit)에 따라 댓글 목록을 가져옵니다.
-    
+    댓글 목록 한 페이지와 다음 페이지를 가리키는 커서를 가져옵니다.
+
+    cursor가 주어지면 (created_at, id) 키셋 탐색으로 조회하므로 페이지 깊이와 무관하게 비용이 일정하고,
+    없으면 기존 page/limit(OFFSET) 방식으로 조회합니다.
+
     Parameters:
-    	page (int): 조회할 페이지 번호(1부터 시작).
+    	page (int): 조회할 페이지 번호(1부터 시작). cursor가 있으면 무시됩니다.
     	limit (int): 한 페이지당 가져올 댓글 수.
-    
+    	cursor (str | None): 이전 응답에서 받은 불투명 커서.
+
     Returns:
-    	comments (list[Comment]): 지정된 페이지와 한도에 해당하는 Comment 객체 목록.
+    	tuple[list[Comment], str | None]: 댓글 목록과 다음 페이지 커서(마지막 페이지이면 None).
+
+    Raises:
+        HTTPException: 커서 형식이 올바르지 않으면 400.
     """
-    skip = (page - 1) * limit
-    return await comment_repo.get_all(db, skip=skip, limit=limit)
+    if cursor:
+        created_at, comment_id = _decode_cursor(cursor)
+        comments = await comment_repo.get_before(db, created_at, comment_id, limit=limit)
+    else:
+        skip = (page - 1) * limit
+        comments = await comment_repo.get_all(db, skip=skip, limit=limit)
 
+    next_cursor = _encode_cursor(comments[-1]) if comments and len(comments) == limit else None
+    return comments, next_cursor
 
-async def create_comment(db: AsyncSession, data: CommentCreate, user: User) -> Comment:
+
+async def get_total_count(db: AsyncSession) -> int:
+    """
+    댓글 총 개수를 반환합니다.
+
+    COMMENT_TOTAL_CACHE_SECONDS 동안은 프로세스 내 캐시 값을 그대로 쓰고, 만료되면 댓글 작성 시 함께 갱신되는
+    집계 행을 기본 키로 한 번 읽습니다. 집계 행이 아직 없을 때(보정 전)만 COUNT(*)로 셉니다.
+    """
+    global _cached_total, _cached_total_expires_at
+
+    now = time.monotonic()
+    if _cached_total is not None and now < _cached_total_expires_at:
+        return _cached_total
+
+    total = await comment_repo.get_maintained_total(db)
+    if total is None:
+        total = await comment_repo.get_total_count(db)
+
+    _cached_total = total
+    _cached_total_expires_at = now + COMMENT_TOTAL_CACHE_SECONDS
+    return total
+
+
+async def reconcile_total_count(db: AsyncSession) -> int:
+    """집계 행을 실제 댓글 수와 대조해 보정하고 프로세스 내 캐시도 갱신합니다."""
+    global _cached_total, _cached_total_expires_at
+
+    total = await comment_repo.reconcile_total(db)
+    _cached_total = total
+    _cached_total_expires_at = time.monotonic() + COMMENT_TOTAL_CACHE_SECONDS
+    return total
+
+
+async def create_comment(db: AsyncSession, data: CommentCreate, user: UserPrincipal) -> Comment:
     """
     새 댓글을 생성하고 생성된 Comment 객체를 반환합니다.
+
+    COMMENT_WRITE_MODE=batch이면 댓글을 배치 큐에 넣고, 다른 요청의 댓글과 함께 커밋될 때까지 기다린 뒤 결과를 받습니다.
     
     Parameters:
         data (CommentCreate): 생성할 댓글의 내용 정보를 담은 DTO.
-        user (User): 댓글 작성자로 연결할 인증된 사용자; 작성자 이름과 user_id로 설정됩니다.
+        user (UserPrincipal): 댓글 작성자로 연결할 인증된 사용자; 작성자 이름과 user_id로 설정됩니다.
     
     Returns:
         Comment: 데이터베이스에 저장된 새 Comment 인스턴스.
     """
+    global _cached_total
+
+    if COMMENT_WRITE_MODE == "batch":
+        # 배치가 커밋될 때까지 기다리는 동안 인증 조회에 쓴 커넥션을 풀에 반납 (flush도 같은 풀을 사용)
+        await db.commit()
+        return await _get_comment_writer().submit(
+            {"user_id": user.id, "author": user.name, "content": data.content}
+        )
+
     comment = Comment(
         user_id=user.id,
         author=user.name,  # 로그인한 유저의 이름을 작성자로 자동 설정
         content=data.content,
     )
-    return await comment_repo.create(db, comment)
\ No newline at end of file
+    created = await comment_repo.create(db, comment)
+    if _cached_total is not None:
+        _cached_total += 1
+    _publish_comments([created])
+    return created
+
+
+async def _flush_comment_batch(rows: list[dict]) -> list[Comment]:
+    """모인 댓글을 전용 세션에서 한 트랜잭션으로 저장하고 총 개수 캐시를 배치 크기만큼 올립니다."""
+    global _cached_total
+
+    async with async_session() as db:
+        created = await comment_repo.create_many(db, rows)
+    if _cached_total is not None:
+        _cached_total += len(created)
+    _publish_comments(created)
+    return created
+
+
+def _get_comment_writer() -> BatchWriter[Comment]:
+    global _comment_writer
+
+    if _comment_writer is None:
+        _comment_writer = BatchWriter(
+            _flush_comment_batch,
+            interval=COMMENT_BATCH_INTERVAL_MS / 1000,
+            max_size=COMMENT_BATCH_MAX_SIZE,
+        )
+    return _comment_writer
+
+
+async def shutdown_comment_writer() -> None:
+    """배치 모드에서 아직 저장되지 않은 댓글을 모두 flush합니다 (앱 종료 시 호출)."""
+    global _comment_writer
+
+    if _comment_writer is not None:
+        await _comment_writer.close()
+        _comment_writer = None
+
+
+def _publish_comments(comments: list[Comment]) -> None:
+    """
+    커밋된 댓글을 이 워커의 스트림 구독자에게 보냅니다.
+
+    댓글마다 JSON은 한 번만 만들고 같은 바이트를 모든 구독자 큐에 넣으며, 구독자가 없으면 직렬화하지 않습니다.
+    """
+    for comment in comments:
+        if comment.id in _published_ids:
+            continue
+        _published_ids[comment.id] = None
+        if len(_published_ids) > _PUBLISHED_IDS_MAXSIZE:
+            _published_ids.popitem(last=False)
+        if _comment_broker.subscriber_count:
+            _comment_broker.publish(
+                StreamEvent("comment", render_json(CommentResponse, comment), comment.id)
+            )
+
+
+async def relay_new_comments(db: AsyncSession) -> int:
+    """
+    마지막으로 확인한 id 이후에 저장된 댓글을 읽어 이 워커의 구독자에게 보냅니다 (COMMENT_STREAM_RELAY_SECONDS 주기).
+
+    다른 워커에서 작성된 댓글을 전달하기 위한 것으로, 구독자 수와 관계없이 워커당 기본 키 범위 조회 한 번이며
+    이 워커에서 이미 발행한 댓글은 건너뜁니다. 구독자가 없으면 조회하지 않고 기준 id를 비워 두며,
+    첫 구독자가 연결될 때 `open_comment_stream`이 다시 맞춥니다.
+    """
+    global _relay_after_id
+
+    if not _comment_broker.subscriber_count:
+        _relay_after_id = None
+        return 0
+
+    if _relay_after_id is None:
+        _relay_after_id = await comment_repo.get_latest_id(db) or 0
+        return 0
+
+    comments = await comment_repo.get_after_id(db, _relay_after_id, limit=_RELAY_BATCH_SIZE)
+    if comments:
+        _relay_after_id = comments[-1].id
+        _publish_comments(comments)
+    return len(comments)
+
+
+def _parse_last_event_id(last_event_id: str | None) -> int | None:
+    if not last_event_id:
+        return None
+    try:
+        return int(last_event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from e
+
+
+async def open_comment_stream(
+    db: AsyncSession, last_event_id: str | None = None
+) -> AsyncIterator[StreamEvent | None]:
+    """
+    새 댓글 스트림을 엽니다.
+
+    Last-Event-ID가 주어지면 그 이후 댓글을 DB에서 먼저 보내고 실시간 이벤트로 이어 갑니다. 구독을 먼저 시작한 뒤
+    조회하므로 그 사이에 저장된 댓글도 놓치지 않습니다. 이 워커의 첫 구독자이면 다른 워커 댓글 릴레이의 기준 id도
+    여기서 맞춥니다. DB 조회는 이 함수 안에서 끝나므로 스트림이 열려 있는 동안 커넥션을 점유하지 않습니다.
+
+    Returns:
+        AsyncIterator[StreamEvent | None]: 보낼 이벤트. None은 하트비트 시점을 뜻합니다.
+
+    Raises:
+        HTTPException: Last-Event-ID 형식이 올바르지 않으면 400, 구독자 수가 상한에 도달했으면 503.
+    """
+    after_id = _parse_last_event_id(last_event_id)
+    if _comment_broker.subscriber_count >= COMMENT_STREAM_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+
+    global _relay_after_id
+
+    subscription = _comment_broker.subscribe()
+    backlog: list[StreamEvent] = []
+    try:
+        if _relay_after_id is None and COMMENT_STREAM_RELAY_SECONDS > 0:
+            # 구독자가 없는 동안 릴레이가 멈춰 있었으므로 지금부터 저장되는 댓글을 릴레이하도록 기준 id를 맞춤
+            _relay_after_id = await comment_repo.get_latest_id(db) or 0
+        if after_id is not None:
+            comments = await comment_repo.get_after_id(db, after_id, limit=COMMENT_STREAM_RESUME_LIMIT + 1)
+            if len(comments) > COMMENT_STREAM_RESUME_LIMIT:
+                # 놓친 댓글이 너무 많으면 이어 보내지 않고 목록(GET /comments)을 다시 받도록 알림
+                backlog.append(StreamEvent("reset", b"{}"))
+                after_id = None
+            else:
+                backlog.extend(
+                    StreamEvent("comment", render_json(CommentResponse, comment), comment.id)
+                    for comment in comments
+                )
+                if comments:
+                    after_id = comments[-1].id
+    except BaseException:
+        _comment_broker.unsubscribe(subscription)
+        raise
+
+    return _stream_events(subscription, backlog, after_id)
+
+
+async def _stream_events(
+    subscription: Subscription[StreamEvent], backlog: list[StreamEvent], after_id: int | None
+) -> AsyncIterator[StreamEvent | None]:
+    try:
+        for event in backlog:
+            yield event
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=COMMENT_STREAM_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield None
+                continue
+            if event is None:
+                # 느린 구독자로 끊김: 스트림을 끝내 클라이언트가 Last-Event-ID로 다시 연결하게 함
+                return
+            # 재연결 직후 DB에서 이미 보낸 댓글은 건너뜀
+            if after_id is None or event.id is None or event.id > after_id:
+                yield event
+    finally:
+        _comment_broker.unsubscribe(subscription)
@@ -0,0 +1,86 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+R = TypeVar("R")
+
+
+class BatchWriter(Generic[R]):
+    """
+    쓰기 요청을 메모리 큐에 모았다가 interval초마다 또는 max_size개가 모이면 한 번에 flush하는 write-behind 큐.
+
+    submit()을 호출한 쪽은 자신의 항목이 포함된 배치가 커밋될 때까지 기다렸다가 flush가 돌려준 결과를 받는다.
+    flush는 항목 목록을 받아 같은 순서의 결과 목록을 반환해야 하며, 예외가 나면 그 배치의 모든 호출자에게 전달된다.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[dict]], Awaitable[list[R]]],
+        interval: float,
+        max_size: int,
+    ):
+        self.interval = interval
+        self.max_size = max_size
+        self._flush_batch = flush
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._has_pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+    async def submit(self, item: dict) -> R:
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.max_size:
+            self._full.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    async def close(self) -> None:
+        """새 요청을 막고 남아 있는 항목을 모두 flush한 뒤 종료한다."""
+        self._closed = True
+        self._has_pending.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if not self._closed:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.interval)
+                except TimeoutError:
+                    pass
+            await self._flush()
+            if self._closed and not self._pending:
+                return
+
+    async def _flush(self) -> None:
+        batch = self._pending[: self.max_size]
+        del self._pending[: self.max_size]
+        if len(self._pending) < self.max_size:
+            self._full.clear()
+        if not self._pending:
+            self._has_pending.clear()
+        if not batch:
+            return
+
+        try:
+            results = await self._flush_batch([item for item, _ in batch])
+        except Exception as e:
+            # 배치 실패는 백그라운드 태스크를 죽이지 않고 각 호출자에게 그대로 전달한다
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -1,23 +1,83 @@
+import os
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
 
+from cache import JsonPayload, TTLCache, build_json_payload
+from metrics import register_cache
 from repositories import settlement_repo, character_repo
 from models.settlement import Settlement
+from schemas.settlement_dto import SettlementResponse
+
+load_dotenv()
+
+# 결산 조회 캐시 설정 (초 단위 / 최대 항목 수)
+SETTLEMENT_LIST_CACHE_SECONDS = float(os.getenv("SETTLEMENT_LIST_CACHE_SECONDS", 60))
+SETTLEMENT_DETAIL_CACHE_SECONDS = float(os.getenv("SETTLEMENT_DETAIL_CACHE_SECONDS", 60))
+READ_CACHE_MAXSIZE = int(os.getenv("READ_CACHE_MAXSIZE", 1024))
+
+settlement_cache: TTLCache[Settlement | list[Settlement] | JsonPayload] = TTLCache(maxsize=READ_CACHE_MAXSIZE)
+register_cache("settlement", settlement_cache)
 
 
 async def get_settlements_by_character(
     db: AsyncSession, character_id: int
 ) -> list[Settlement]:
-    character = await character_repo.get_by_id(db, character_id)
-    if not character:
-        raise HTTPException(status_code=404, detail="Character not found")
-    return await settlement_repo.get_by_character_id(db, character_id)
+    settlements = settlement_cache.get(("character", character_id))
+    if settlements is None:
+        character = await character_repo.get_with_settlements(db, character_id)
+        if not character:
+            raise HTTPException(status_code=404, detail="Character not found")
+        settlements = list(character.settlements)
+        settlement_cache.set(("character", character_id), settlements, ttl=SETTLEMENT_LIST_CACHE_SECONDS)
+    return settlements
+
+
+async def get_settlements_by_character_payload(
+    db: AsyncSession, character_id: int
+) -> JsonPayload:
+    """
+    캐릭터의 결산 목록 응답을 미리 직렬화한 JSON 바이트로 반환한다.
+
+    직렬화 결과는 목록 캐시와 같은 SETTLEMENT_LIST_CACHE_SECONDS 동안만 유지하며, 만료되면 DB에서 다시 읽어
+    목록 캐시와 함께 갱신한다.
+    """
+    payload = settlement_cache.get(("character", character_id, "payload"))
+    if payload is None:
+        settlement_cache.invalidate(("character", character_id))
+        settlements = await get_settlements_by_character(db, character_id)
+        payload = build_json_payload(list[SettlementResponse], settlements)
+        settlement_cache.set(("character", character_id, "payload"), payload, ttl=SETTLEMENT_LIST_CACHE_SECONDS)
+    return payload
 
 
 async def get_settlement_detail(
     db: AsyncSession, settlement_id: int
 ) -> Settlement:
-    settlement = await settlement_repo.get_by_id(db, settlement_id)
-    if not settlement:
-        raise HTTPException(status_code=404, detail="Settlement not found")
+    settlement = settlement_cache.get(("detail", settlement_id))
+    if settlement is None:
+        settlement = await settlement_repo.get_by_id(db, settlement_id)
+        if not settlement:
+            raise HTTPException(status_code=404, detail="Settlement not found")
+        settlement_cache.set(("detail", settlement_id), settlement, ttl=SETTLEMENT_DETAIL_CACHE_SECONDS)
     return settlement
+
+
+def invalidate_settlement_cache(
+    character_id: int | None = None, settlement_id: int | None = None
+) -> None:
+    """
+    결산 데이터를 변경하는 쓰기 경로에서 호출하여 캐시된 조회 결과를 무효화한다.
+
+    인자를 모두 생략하면 전체 결산 캐시를 비운다. 캐릭터+결산 통합 응답 캐시까지 비우려면
+    `character_service.invalidate_character_cache`를 호출한다.
+    """
+    if character_id is None and settlement_id is None:
+        settlement_cache.clear()
+        return
+    if character_id is not None:
+        settlement_cache.invalidate(("character", character_id))
+        settlement_cache.invalidate(("character", character_id, "payload"))
+    if settlement_id is not None:
+        settlement_cache.invalidate(("detail", settlement_id))
@@ -1,17 +1,24 @@
+import asyncio
 import datetime
+import functools
 import os
 import secrets
 import hashlib
-import httpx
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 from fastapi import HTTPException, status
-from jose import jwt, JWTError
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
+from cache import TTLCache
+from http_client import get_http_client
+from metrics import record_password_hash, register_cache
 from models.user import User
 from repositories import user_repo
-from schemas.user_dto import UserCreate, Token
+from schemas.user_dto import UserCreate, Token, UserPrincipal
 
 # 환경 변수 로드
 load_dotenv()
@@ -29,8 +36,44 @@ KAKAO_CLIENT_ID = os.getenv("KAKAO_CLIENT_ID")
 KAKAO_REDIRECT_URI = os.getenv("KAKAO_REDIRECT_URI")
 KAKAO_CLIENT_SECRET = os.getenv("KAKAO_CLIENT_SECRET")
 KAKAO_ADMIN_KEY = os.getenv("KAKAO_ADMIN_KEY")
+# 카카오 API 주소 (로컬 스텁 서버로 테스트할 때 변경)
+KAKAO_AUTH_BASE_URL = os.getenv("KAKAO_AUTH_BASE_URL", "https://kauth.kakao.com")
+KAKAO_API_BASE_URL = os.getenv("KAKAO_API_BASE_URL", "https://kapi.kakao.com")
+# 카카오 호스트별 요청 제한 시간 (초 단위, kauth: 토큰 교환, kapi: 사용자 정보/연결 해제)
+KAKAO_AUTH_TIMEOUT_SECONDS = float(os.getenv("KAKAO_AUTH_TIMEOUT_SECONDS", 5))
+KAKAO_API_TIMEOUT_SECONDS = float(os.getenv("KAKAO_API_TIMEOUT_SECONDS", 5))
+
+# 토큰 클레임만으로 인증할 때 사용자 존재 여부를 다시 확인하는 주기 (초 단위, 탈퇴 반영 최대 지연 시간)
+AUTH_USER_CACHE_SECONDS = float(os.getenv("AUTH_USER_CACHE_SECONDS", 60))
+
+# 비밀번호 해싱 스레드 풀 설정 (동시 bcrypt 작업 수 / 대기 허용 작업 수)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+@functools.cache
+def _pwd_context():
+    """
+    bcrypt CryptContext를 처음 사용할 때 만든다.
+
+    passlib/bcrypt와 python-jose는 로그인·가입 등 인증 요청에서만 쓰이므로 사용하는 함수 안에서 import해
+    읽기 요청만 처리하는 워커의 시작(import) 시간을 줄인다.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+# 스레드 풀에 제출된 뒤 아직 끝나지 않은 bcrypt 작업 수 (완료 콜백이 풀 스레드에서 줄이므로 잠금으로 보호)
+_password_pending = 0
+_password_pending_lock = threading.Lock()
+
+# username -> DB에서 확인한 (id, name). 토큰의 uid/name이 이 값과 같을 때만 DB 조회를 건너뜀
+_verified_users: TTLCache[tuple[int, str]] = TTLCache(maxsize=10_000, ttl=AUTH_USER_CACHE_SECONDS)
+register_cache("verified_users", _verified_users)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
 
 # --- 보안 유틸리티 ---
 
@@ -50,7 +93,7 @@ def verify_password(plain_password: str, hashed_password: str | None) -> bool:
     """
     if hashed_password is None:
         return False
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
@@ -62,7 +105,55 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: 입력된 비밀번호의 bcrypt 해시 문자열
     """
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
+
+def _release_password_slot(_future: Future | None = None) -> None:
+    global _password_pending
+
+    with _password_pending_lock:
+        _password_pending -= 1
+
+async def _run_password_task(func: Callable[..., T], *args) -> T:
+    """
+    bcrypt 작업을 이벤트 루프 밖의 전용 스레드 풀에서 실행한다.
+
+    실행 중이거나 대기 중인 작업이 PASSWORD_HASH_MAX_PENDING 이상이면 큐에 쌓지 않고 즉시 503으로 거절한다.
+    대기 중인 요청이 취소(클라이언트 연결 끊김)되어도 이미 실행 중인 작업은 끝까지 돌므로,
+    작업 수는 요청이 아니라 스레드 풀 작업이 끝날 때(완료 콜백) 줄인다.
+    """
+    global _password_pending
+
+    with _password_pending_lock:
+        if _password_pending >= PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests. Please try again later.",
+                headers={"Retry-After": "1"},
+            )
+        _password_pending += 1
+    start = time.perf_counter()
+    try:
+        future = _password_executor.submit(func, *args)
+    except RuntimeError:
+        _release_password_slot()
+        raise
+    future.add_done_callback(_release_password_slot)
+    try:
+        return await asyncio.wrap_future(future)
+    finally:
+        record_password_hash(func.__name__, time.perf_counter() - start)
+
+async def verify_password_async(plain_password: str, hashed_password: str | None) -> bool:
+    """`verify_password`를 비밀번호 해싱 스레드 풀에서 실행한다."""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """`get_password_hash`를 비밀번호 해싱 스레드 풀에서 실행한다."""
+    return await _run_password_task(get_password_hash, password)
+
+def shutdown_password_executor() -> None:
+    """비밀번호 해싱 스레드 풀을 종료한다 (애플리케이션 종료 시 호출)."""
+    _password_executor.shutdown(wait=False, cancel_futures=True)
 
 def hash_refresh_token(token: str) -> str:
     """
@@ -85,6 +176,8 @@ def create_access_token(data: dict) -> str:
     Returns:
         encoded_jwt (str): 서명된 JWT 문자열
     """
+    from jose import jwt
+
     to_encode = data.copy()
     # JWT 표준 검증(jose)은 UTC를 기준으로 하므로, exp는 UTC로 설정해야 정확히 만료됩니다.
     expire = datetime.datetime.now(datetime.UTC) + datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -92,6 +185,10 @@ def create_access_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _access_token_claims(user: User) -> dict:
+    """핸들러가 DB 조회 없이 사용할 수 있도록 액세스 토큰에 담을 사용자 클레임."""
+    return {"sub": user.username, "uid": user.id, "name": user.name}
+
 def create_register_token(data: dict) -> str:
     """
     회원 가입 절차에서 사용되는 만료 5분의 임시 등록 JWT 토큰을 생성한다.
@@ -102,6 +199,8 @@ def create_register_token(data: dict) -> str:
     Returns:
         str: 만료일(`exp`)과 `is_register` 클레임을 포함한 등록용 JWT 문자열.
     """
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.datetime.now(datetime.UTC) + datetime.timedelta(minutes=5)
     to_encode.update({"exp": expire, "is_register": True})
@@ -127,7 +226,7 @@ async def _issue_service_tokens(db: AsyncSession, user: User) -> tuple[Token, st
     Returns:
         tuple[Token, str]: 생성된 `Token`(access_token과 token_type 포함)과 평문 리프레시 토큰 문자열
     """
-    at = create_access_token(data={"sub": user.username})
+    at = create_access_token(data=_access_token_claims(user))
     rt = create_refresh_token()
     
     now_kst = datetime.datetime.now(KST).replace(tzinfo=None)
@@ -137,6 +236,31 @@ async def _issue_service_tokens(db: AsyncSession, user: User) -> tuple[Token, st
     
     return Token(access_token=at, token_type="bearer"), rt
 
+async def get_principal(db: AsyncSession, claims: dict) -> UserPrincipal | None:
+    """
+    검증된 액세스 토큰 클레임으로 인증 사용자 정보를 만든다.
+
+    토큰의 `uid`/`name` 클레임이 AUTH_USER_CACHE_SECONDS 안에 DB에서 확인한 사용자의 (id, name)과 같으면
+    DB를 조회하지 않는다. 그 외(캐시 만료, 값 불일치, 클레임이 없는 이전 토큰)에는 사용자를 한 번 조회하며,
+    토큰의 uid가 현재 같은 username을 가진 사용자의 id와 다르면(탈퇴 후 같은 username으로 재가입 등) 거절한다.
+    탈퇴한 사용자의 토큰은 다른 워커에서도 최대 AUTH_USER_CACHE_SECONDS 이후 거절된다.
+
+    Returns:
+        UserPrincipal | None: 인증 사용자 정보, 사용자가 없거나 토큰이 다른 계정의 것이면 None.
+    """
+    username = claims["sub"]
+    user_id = claims.get("uid")
+    name = claims.get("name")
+    if user_id is not None and _verified_users.get(username) == (user_id, name):
+        return UserPrincipal(id=user_id, username=username, name=name)
+
+    user = await user_repo.get_by_username(db, username)
+    if user is None or (user_id is not None and user_id != user.id):
+        _verified_users.invalidate(username)
+        return None
+    _verified_users.set(username, (user.id, user.name))
+    return UserPrincipal.model_validate(user)
+
 async def process_kakao_login(db: AsyncSession, code: str) -> dict:
     """
     카카오 OAuth 코드로 카카오 사용자 정보를 조회해, 기존 사용자면 서비스 접근/갱신 토큰을 발급하고 새 사용자면 회원가입을 위한 등록 토큰을 생성하여 반환한다.
@@ -156,86 +280,84 @@ async def process_kakao_login(db: AsyncSession, code: str) -> dict:
     Raises:
         HTTPException: 카카오 토큰 교환 또는 사용자 정보 조회에 실패할 경우 401 상태 코드로 발생한다.
     """
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        # 1. 카카오 액세스 토큰 요청
-        token_res = await client.post(
-            "https://kauth.kakao.com/oauth/token",
-            data={
-                "grant_type": "authorization_code",
-                "client_id": KAKAO_CLIENT_ID,
-                "redirect_uri": KAKAO_REDIRECT_URI,
-                "code": code,
-                "client_secret": KAKAO_CLIENT_SECRET,
-            }
-        )
-        if token_res.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid kakao authorization code")
-        
-        kakao_access_token = token_res.json().get("access_token")
+    client = get_http_client()
+
+    # 1. 카카오 액세스 토큰 요청
+    token_res = await client.post(
+        f"{KAKAO_AUTH_BASE_URL}/oauth/token",
+        data={
+            "grant_type": "authorization_code",
+            "client_id": KAKAO_CLIENT_ID,
+            "redirect_uri": KAKAO_REDIRECT_URI,
+            "code": code,
+            "client_secret": KAKAO_CLIENT_SECRET,
+        },
+        timeout=KAKAO_AUTH_TIMEOUT_SECONDS,
+    )
+    if token_res.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid kakao authorization code")
+    
+    kakao_access_token = token_res.json().get("access_token")
 
-        # 2. 카카오 유저 정보 요청
-        user_res = await client.get(
-            "https://kapi.kakao.com/v2/user/me",
-            headers={"Authorization": f"Bearer {kakao_access_token}"}
-        )
-        if user_res.status_code != 200:
-            raise HTTPException(status_code=401, detail="Failed to fetch kakao user info")
-        
-        kakao_data = user_res.json()
-        kakao_id = kakao_data.get("id")
-        kakao_account = kakao_data.get("kakao_account", {})
-        profile = kakao_account.get("profile", {})
-        
-        # 카카오에서 제공하는 추가 정보 추출 및 한국식 번호 변환 (+82 10-XXXX-XXXX -> 010-XXXX-XXXX)
-        raw_phone = kakao_account.get("phone_number")
-        phone_number = raw_phone.replace("+82 ", "0").replace("+82", "0").replace(" ", "") if raw_phone else None
-        
-        birthyear = kakao_account.get("birthyear")
-        birthday = kakao_account.get("birthday")
-        birthdate = None
-        if birthyear and birthday:
-            try:
-                birthdate = datetime.date.fromisoformat(f"{birthyear}-{birthday[:2]}-{birthday[2:]}")
-            except ValueError:
-                birthdate = None
-
-        gender = kakao_account.get("gender") # male / female
-
-        # 3. 기존 회원 여부 확인 (1순위: kakao_ 접두사 username, 2순위: phone_number 연동)
-        user = await user_repo.get_by_username(db, f"kakao_{kakao_id}")
-
-        if not user and phone_number:
-            # 기존 계정이 있는지 확인 (전화번호 연동)
-            existing_user = await user_repo.get_by_phone_number(db, phone_number)
-            if existing_user:
-                # 계정 자동 연동: 기존 계정에 kakao_id 부여
-                existing_user.kakao_id = kakao_id
-                await db.commit()
-                user = existing_user
-
-        if user:
-            # CASE A: 기존 유저 또는 연동된 유저 -> 즉시 로그인
-            tokens, rt = await _issue_service_tokens(db, user)
-            return {
-                "is_new_user": False,
-                "access_token": tokens.access_token,
-                "refresh_token": rt
-            }
-        else:
-            # CASE B: 완전히 새로운 유저 -> Register Token 발급
-            # 실명(name)을 최우선으로, 없으면 닉네임을 사용
-            real_name = kakao_account.get("name") or profile.get("nickname") or "카카오사용자"
-            reg_token = create_register_token({
-                "kakao_id": kakao_id,
-                "phone_number": phone_number,
-                "birthdate": str(birthdate) if birthdate else None,
-                "gender": gender,
-                "temp_name": real_name
-            })
-            return {
-                "is_new_user": True,
-                "register_token": reg_token
-            }
+    # 2. 카카오 유저 정보 요청
+    user_res = await client.get(
+        f"{KAKAO_API_BASE_URL}/v2/user/me",
+        headers={"Authorization": f"Bearer {kakao_access_token}"},
+        timeout=KAKAO_API_TIMEOUT_SECONDS,
+    )
+    if user_res.status_code != 200:
+        raise HTTPException(status_code=401, detail="Failed to fetch kakao user info")
+    
+    kakao_data = user_res.json()
+    kakao_id = kakao_data.get("id")
+    kakao_account = kakao_data.get("kakao_account", {})
+    profile = kakao_account.get("profile", {})
+    
+    # 카카오에서 제공하는 추가 정보 추출 및 한국식 번호 변환 (+82 10-XXXX-XXXX -> 010-XXXX-XXXX)
+    raw_phone = kakao_account.get("phone_number")
+    phone_number = raw_phone.replace("+82 ", "0").replace("+82", "0").replace(" ", "") if raw_phone else None
+    
+    birthyear = kakao_account.get("birthyear")
+    birthday = kakao_account.get("birthday")
+    birthdate = None
+    if birthyear and birthday:
+        try:
+            birthdate = datetime.date.fromisoformat(f"{birthyear}-{birthday[:2]}-{birthday[2:]}")
+        except ValueError:
+            birthdate = None
+
+    gender = kakao_account.get("gender") # male / female
+
+    # 3. 기존 회원 여부 확인 (1순위: kakao_ 접두사 username, 2순위: kakao_id, 3순위: phone_number 연동) - 쿼리 1회
+    user = await user_repo.get_by_kakao_identity(db, kakao_id, phone_number)
+
+    if user and user.kakao_id != kakao_id:
+        # 계정 자동 연동: 기존 계정에 kakao_id 부여 (토큰 발급과 같은 커밋으로 저장)
+        user.kakao_id = kakao_id
+
+    if user:
+        # CASE A: 기존 유저 또는 연동된 유저 -> 즉시 로그인
+        tokens, rt = await _issue_service_tokens(db, user)
+        return {
+            "is_new_user": False,
+            "access_token": tokens.access_token,
+            "refresh_token": rt
+        }
+    else:
+        # CASE B: 완전히 새로운 유저 -> Register Token 발급
+        # 실명(name)을 최우선으로, 없으면 닉네임을 사용
+        real_name = kakao_account.get("name") or profile.get("nickname") or "카카오사용자"
+        reg_token = create_register_token({
+            "kakao_id": kakao_id,
+            "phone_number": phone_number,
+            "birthdate": str(birthdate) if birthdate else None,
+            "gender": gender,
+            "temp_name": real_name
+        })
+        return {
+            "is_new_user": True,
+            "register_token": reg_token
+        }
 
 async def finalize_kakao_registration(
     db: AsyncSession, 
@@ -256,6 +378,8 @@ async def finalize_kakao_registration(
     Returns:
         tuple: 첫 번째 요소는 발급된 액세스 토큰(`Token`), 두 번째 요소는 평문 리프레시 토큰 문자열.
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(register_token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
         if not payload.get("is_register"):
@@ -281,6 +405,7 @@ async def finalize_kakao_registration(
         gender=gender
     )
     user = await user_repo.create(db, new_user)
+    _verified_users.invalidate(user.username)
     return await _issue_service_tokens(db, user)
 
 async def signup(db: AsyncSession, user_data: UserCreate) -> User:
@@ -303,13 +428,17 @@ async def signup(db: AsyncSession, user_data: UserCreate) -> User:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
-    
+    await db.commit()
+
     new_user = User(
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         name=user_data.name
     )
-    return await user_repo.create(db, new_user)
+    user = await user_repo.create(db, new_user)
+    # 탈퇴한 계정과 같은 username이면 이전 계정의 확인 결과를 버림
+    _verified_users.invalidate(user.username)
+    return user
 
 async def login(db: AsyncSession, username: str, password: str) -> tuple[Token, str]:
     """
@@ -322,9 +451,11 @@ async def login(db: AsyncSession, username: str, password: str) -> tuple[Token,
         HTTPException: 자격증명이 올바르지 않을 경우 401 Unauthorized 상태의 예외를 발생시킨다.
     """
     user = await user_repo.get_by_username(db, username)
+    # bcrypt 검증 동안 DB 커넥션을 점유하지 않도록 조회 트랜잭션을 먼저 끝낸다
+    await db.commit()
 
     # 500 에러 방지: 카카오 전용 계정(hashed_password가 None)이거나 비밀번호가 틀린 경우
-    if not user or user.hashed_password is None or not verify_password(password, user.hashed_password):
+    if not user or user.hashed_password is None or not await verify_password_async(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -358,7 +489,7 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> tuple[To
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired")
     
     # 새로운 토큰 발급 (Rotation)
-    new_at = create_access_token(data={"sub": user.username})
+    new_at = create_access_token(data=_access_token_claims(user))
     new_rt = create_refresh_token()
     
     user.refresh_token_hash = hash_refresh_token(new_rt)
@@ -384,28 +515,31 @@ async def withdraw_user(db: AsyncSession, user: User) -> None:
         if not KAKAO_ADMIN_KEY:
             raise HTTPException(status_code=500, detail="KAKAO_ADMIN_KEY is not configured in .env")
             
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            unlink_url = "https://kapi.kakao.com/v1/user/unlink"
-            # Admin Key 방식은 'KakaoAK ' 접두사를 사용합니다.
-            headers = {
-                "Authorization": f"KakaoAK {KAKAO_ADMIN_KEY}",
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-            # target_id로 탈퇴 대상을 지정 (JWT에서 나온 현재 유저의 kakao_id만 사용)
-            data = {
-                "target_id_type": "user_id",
-                "target_id": user.kakao_id
-            }
-            
-            res = await client.post(unlink_url, headers=headers, data=data)
-            
-            # 카카오 서버 응답 확인
-            if res.status_code != 200:
-                # 보안상 상세 에러는 로그로만 남기는 것이 좋지만, 현재는 로그 시스템이 없으므로 주석 처리하거나 단순화
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to unlink Kakao account. Please try again later."
-                )
+        client = get_http_client()
+        unlink_url = f"{KAKAO_API_BASE_URL}/v1/user/unlink"
+        # Admin Key 방식은 'KakaoAK ' 접두사를 사용합니다.
+        headers = {
+            "Authorization": f"KakaoAK {KAKAO_ADMIN_KEY}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        # target_id로 탈퇴 대상을 지정 (JWT에서 나온 현재 유저의 kakao_id만 사용)
+        data = {
+            "target_id_type": "user_id",
+            "target_id": user.kakao_id
+        }
+        
+        res = await client.post(
+            unlink_url, headers=headers, data=data, timeout=KAKAO_API_TIMEOUT_SECONDS
+        )
+        
+        # 카카오 서버 응답 확인
+        if res.status_code != 200:
+            # 보안상 상세 에러는 로그로만 남기는 것이 좋지만, 현재는 로그 시스템이 없으므로 주석 처리하거나 단순화
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to unlink Kakao account. Please try again later."
+            )
 
     # 2. DB 삭제 진행
-    await user_repo.delete(db, user)
\ No newline at end of file
+    await user_repo.delete(db, user)
+    _verified_users.invalidate(user.username)
\ No newline at end of file
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+# 테스트는 실제 DB 파일(maplewind.db)이나 .env의 DB를 건드리지 않도록 임시 디렉터리의 SQLite 파일을 사용한다
+# (메모리 DB는 커넥션마다 따로 생기므로 쓰기/조회 풀을 함께 쓰는 앱 테스트에 쓸 수 없음)
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="maplewind-test-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TEST_DB_DIR}/test.db"
+os.environ["DB_BOOTSTRAP_LOCK_FILE"] = os.path.join(_TEST_DB_DIR, "bootstrap.lock")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("COOKIE_SECURE", "False")
+os.environ["SEED_ON_STARTUP"] = "True"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["COMMENT_STREAM_RELAY_SECONDS"] = "0"
+
+import httpx
+import pytest
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """
+    lifespan(스키마 생성, 시드)을 실행한 앱에 연결된 httpx 클라이언트 (세션 전체에서 앱을 한 번만 시작함).
+
+    lifespan 종료가 비밀번호 해싱 스레드 풀 등 프로세스 전역 자원을 닫으므로 테스트마다 다시 시작하지 않는다.
+
+    httpx.ASGITransport는 앱을 테스트와 같은 태스크에서 실행하므로 query_monitor.query_budget으로 쿼리 수를 셀 수 있다.
+    """
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
@@ -0,0 +1,95 @@
+"""
+카카오 로그인 흐름을 로컬 스텁 OAuth 서버(httpx.MockTransport)로 검사한다.
+
+스텁은 공유 클라이언트(http_client.get_http_client)의 전송 계층으로 주입하므로, 로그인마다 같은 클라이언트와
+커넥션 풀을 재사용하는지도 함께 확인한다.
+"""
+import httpx
+import pytest
+
+import http_client
+from services import user_service
+
+pytestmark = pytest.mark.anyio
+
+KAKAO_LOGIN_PATH = "/api/v1/users/auth/kakao/login"
+KAKAO_ID = 4242
+
+
+class StubKakao:
+    """카카오 토큰 발급(/oauth/token)과 사용자 정보(/v2/user/me) 엔드포인트를 흉내 낸다."""
+
+    def __init__(self, token_status: int = 200):
+        self.token_status = token_status
+        self.requests: list[httpx.Request] = []
+        self.clients: list[httpx.AsyncClient] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/oauth/token":
+            if self.token_status != 200:
+                return httpx.Response(self.token_status, json={"error": "invalid_grant"})
+            return httpx.Response(200, json={"access_token": "stub-kakao-token"})
+        if request.url.path == "/v2/user/me":
+            assert request.headers["Authorization"] == "Bearer stub-kakao-token"
+            return httpx.Response(200, json={
+                "id": KAKAO_ID,
+                "kakao_account": {
+                    "name": "카카오테스트",
+                    "phone_number": "+82 10-4242-4242",
+                    "gender": "female",
+                },
+            })
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def stub_kakao(monkeypatch):
+    """공유 클라이언트를 스텁 전송 계층으로 새로 만들고, 클라이언트 생성 횟수를 센다."""
+    stub = StubKakao()
+
+    def create_client() -> httpx.AsyncClient:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+        stub.clients.append(client)
+        return client
+
+    monkeypatch.setattr(http_client, "_client", None)
+    monkeypatch.setattr(http_client, "_create_client", create_client)
+    monkeypatch.setattr(user_service, "KAKAO_AUTH_BASE_URL", "http://kauth.stub")
+    monkeypatch.setattr(user_service, "KAKAO_API_BASE_URL", "http://kapi.stub")
+    return stub
+
+
+async def test_kakao_login_reuses_shared_client(client, stub_kakao):
+    first = await client.post(KAKAO_LOGIN_PATH, params={"code": "first"})
+    assert first.status_code == 200
+    assert first.json()["is_new_user"] is True
+
+    registered = await client.post("/api/v1/users/auth/kakao/register", json={
+        "register_token": first.json()["register_token"],
+        "student_id": "20264242",
+        "nickname": "스텁",
+    })
+    assert registered.status_code == 201
+
+    second = await client.post(KAKAO_LOGIN_PATH, params={"code": "second"})
+    assert second.status_code == 200
+    assert second.json()["is_new_user"] is False
+    assert second.json()["access_token"]
+    assert "refresh_token" in second.cookies
+
+    # 두 로그인 모두 하나의 공유 클라이언트(같은 커넥션 풀)로 토큰 교환 + 사용자 정보 조회를 했는지 확인
+    assert [request.url.path for request in stub_kakao.requests] == ["/oauth/token", "/v2/user/me"] * 2
+    assert len(stub_kakao.clients) == 1
+    assert http_client.get_http_client() is stub_kakao.clients[0]
+
+
+async def test_kakao_login_rejects_invalid_code(client, stub_kakao):
+    stub_kakao.token_status = 401
+
+    response = await client.post(KAKAO_LOGIN_PATH, params={"code": "expired"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid kakao authorization code"
+    # 토큰 교환이 실패하면 사용자 정보는 조회하지 않는다
+    assert [request.url.path for request in stub_kakao.requests] == ["/oauth/token"]
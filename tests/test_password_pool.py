@@ -0,0 +1,41 @@
+"""
+비밀번호 해싱 스레드 풀의 대기 작업 상한(PASSWORD_HASH_MAX_PENDING)이 실제 실행 중인 bcrypt 작업 수를 따르는지 확인한다.
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from services import user_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cancelled_request_keeps_slot_until_job_finishes(monkeypatch):
+    monkeypatch.setattr(user_service, "PASSWORD_HASH_MAX_PENDING", 1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash() -> str:
+        started.set()
+        release.wait(5)
+        return "hash"
+
+    request = asyncio.create_task(user_service._run_password_task(slow_hash))
+    await asyncio.to_thread(started.wait, 5)
+
+    # 클라이언트 연결이 끊겨 요청이 취소되어도 스레드 풀 작업은 계속 실행 중이므로 자리를 비우지 않는다
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    with pytest.raises(HTTPException) as rejected:
+        await user_service._run_password_task(slow_hash)
+    assert rejected.value.status_code == 503
+
+    release.set()
+    for _ in range(100):
+        if user_service._password_pending == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert user_service._password_pending == 0
+    assert await user_service._run_password_task(slow_hash) == "hash"
@@ -0,0 +1,46 @@
+"""
+조회 엔드포인트의 요청당 쿼리 수가 늘지 않았는지(N+1 등) query_monitor.query_budget으로 확인한다.
+
+프로세스 내 캐시를 비운 뒤 요청하므로 캐시 적중 없이 DB에서 읽는 경우의 쿼리 수를 검사한다.
+"""
+import pytest
+
+from query_monitor import query_budget
+from services import character_service, comment_service, settlement_service
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def cold_caches(monkeypatch):
+    character_service.character_cache.clear()
+    settlement_service.settlement_cache.clear()
+    monkeypatch.setattr(comment_service, "_cached_total", None)
+
+
+@pytest.mark.parametrize(
+    ("path", "max_queries"),
+    [
+        # 캐릭터 + 결산 조인 1회
+        ("/api/v1/characters/1/with-settlements", 1),
+        ("/api/v1/characters/1/settlements", 1),
+        # 댓글 페이지 1회 + 댓글 수 집계 행 1회 (집계 캐시가 비어 있을 때)
+        ("/api/v1/comments", 2),
+    ],
+)
+async def test_read_endpoint_query_budget(client, path, max_queries):
+    with query_budget(max_queries, max_repeats=1):
+        response = await client.get(path)
+
+    assert response.status_code == 200
+
+
+async def test_comment_cursor_page_query_budget(client):
+    first = await client.get("/api/v1/comments", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+
+    with query_budget(1, max_repeats=1):
+        response = await client.get("/api/v1/comments", params={"limit": 2, "cursor": cursor})
+
+    assert response.status_code == 200
+    assert response.json()
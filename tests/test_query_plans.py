@@ -0,0 +1,80 @@
+"""
+자주 실행되는 조회 쿼리가 인덱스를 타는지 SQLite EXPLAIN QUERY PLAN으로 확인한다.
+
+리포지토리 함수를 메모리 DB에서 실제로 실행해 나간 SELECT를 그대로 EXPLAIN하므로, 쿼리나 인덱스 정의가 바뀌어
+테이블 전체 스캔("SCAN <table>")으로 떨어지면 실패한다. 인덱스 순서로 읽는 "SCAN ... USING INDEX"는 허용한다.
+"""
+import asyncio
+import datetime
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401 (모든 테이블을 Base.metadata에 등록)
+from database import Base
+from repositories import character_repo, comment_repo, settlement_repo, user_repo
+
+QUERIES: dict[str, Callable[[AsyncSession], Awaitable[object]]] = {
+    "settlements_by_character": lambda db: settlement_repo.get_by_character_id(db, 1),
+    "character_with_settlements": lambda db: character_repo.get_with_settlements(db, 1),
+    "comments_offset": lambda db: comment_repo.get_all(db, skip=20, limit=20),
+    "comments_cursor": lambda db: comment_repo.get_before(db, datetime.datetime(2026, 1, 1), 10, limit=20),
+    "comments_after_id": lambda db: comment_repo.get_after_id(db, 10),
+    "user_by_refresh_token_hash": lambda db: user_repo.get_by_rt_hash(db, "hash"),
+    "user_by_kakao_identity": lambda db: user_repo.get_by_kakao_identity(db, 1234, "010-1234-5678"),
+}
+
+
+async def _query_plans(query: Callable[[AsyncSession], Awaitable[object]]) -> list[list[str]]:
+    """query가 실행한 SELECT마다 EXPLAIN QUERY PLAN의 detail 목록을 반환한다."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    statements: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        async with AsyncSession(engine) as db:
+            await query(db)
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        plans = []
+        async with engine.connect() as conn:
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append([row[3] for row in result])
+        return plans
+    finally:
+        await engine.dispose()
+
+
+def _table_scans(plan: list[str]) -> list[str]:
+    return [detail for detail in plan if detail.startswith("SCAN") and "USING" not in detail]
+
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_query_does_not_scan_table(name: str):
+    plans = asyncio.run(_query_plans(QUERIES[name]))
+
+    assert plans, f"{name}: SELECT가 실행되지 않음"
+    for plan in plans:
+        assert not _table_scans(plan), f"{name}: 테이블 전체 스캔 {plan}"
+
+
+def test_table_scan_is_detected():
+    """인덱스가 없는 컬럼 조건은 SCAN으로 잡혀야 한다 (검사 자체가 동작하는지 확인)."""
+    from sqlalchemy import select
+
+    from models.comment import Comment
+
+    plans = asyncio.run(_query_plans(lambda db: db.execute(select(Comment).where(Comment.content == "x"))))
+
+    assert _table_scans(plans[0])
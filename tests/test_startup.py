@@ -0,0 +1,52 @@
+"""
+워커 시작 경로가 무거워지지 않았는지 확인한다.
+
+`import main`을 새 인터프리터에서 실행해 import 시간이 예산 안인지, 인증·외부 호출에만 쓰는 모듈이
+시작 시 import되지 않는지 검사한다.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# 개발 환경에서 약 0.9초. 느린 CI 머신을 고려해 여유를 둔 값이며 STARTUP_IMPORT_BUDGET_SECONDS로 조정한다
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", 2.0))
+# 사용하는 함수 안에서 import해야 하는 모듈 (services/user_service.py, http_client.py 참고)
+LAZY_MODULES = ("httpx", "passlib", "jose", "bcrypt")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def _import_main() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "SEED_ON_STARTUP": "False"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_main_within_budget():
+    # 첫 실행은 .pyc 생성과 디스크 캐시 때문에 느릴 수 있으므로 두 번 중 빠른 값을 사용
+    seconds = min(_import_main()["seconds"] for _ in range(2))
+
+    assert seconds < STARTUP_IMPORT_BUDGET_SECONDS, (
+        f"import main took {seconds:.2f}s (budget {STARTUP_IMPORT_BUDGET_SECONDS:.2f}s), "
+        "python -X importtime -c 'import main'으로 원인 모듈을 확인하세요"
+    )
+
+
+def test_import_main_skips_lazy_modules():
+    assert _import_main()["loaded"] == []